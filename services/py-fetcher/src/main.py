@@ -1,30 +1,67 @@
-from fastapi import FastAPI, HTTPException, Request
-from fastapi.responses import JSONResponse
+import asyncio
+import hashlib
+import os
+import re
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, HTTPException, Request, Response
+from fastapi.responses import JSONResponse, ORJSONResponse
 from fastapi.exceptions import RequestValidationError
+from niche_explorer_models.models.article import Article
 from niche_explorer_models.models.article_fetch_request import ArticleFetchRequest
 from niche_explorer_models.models.article_fetch_response import ArticleFetchResponse
-from typing import Dict, List
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Tuple
+import orjson
 from starlette_prometheus import metrics, PrometheusMiddleware
 
 import logging
 from .services.arxiv_service import arxiv_fetcher
 from .services.reddit_service import reddit_fetcher
+from .services.http_client import aclose_http_client
 from .services.arxiv_categories import CATEGORIES as ARVIX_CATEGORIES
 
 logger = logging.getLogger("article_fetcher")
-# Enable debug logging by default (can be overridden by container env)
-logging.basicConfig(level=logging.DEBUG)
+# Configure root logging level from environment variable (debug by default)
+numeric_level = getattr(logging, os.getenv("LOG_LEVEL", "DEBUG").upper(), logging.DEBUG)
+logging.basicConfig(level=numeric_level)
+
+# The category catalogue is static – encode it once instead of per request
+_ARXIV_CATEGORIES_JSON = orjson.dumps(ARVIX_CATEGORIES)
+# Lets clients and gateways revalidate the catalogue with a 304 instead of
+# downloading it again; the tag only changes when a deploy changes the data
+_ARXIV_CATEGORIES_HEADERS = {
+    "Cache-Control": "public, max-age=86400",
+    "ETag": f'"{hashlib.sha256(_ARXIV_CATEGORIES_JSON).hexdigest()[:32]}"',
+}
+
+_QUERY_TOKEN_RE = re.compile(r"cat:|all:|AND")
+
+# Request all arXiv fallback queries at once instead of one after another
+SPECULATIVE_FALLBACK = os.getenv("SPECULATIVE_FALLBACK", "0") == "1"
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # Release pooled connections to the feed hosts
+    await aclose_http_client()
+
 
 # Initialize FastAPI app with metadata matching OpenAPI spec
 app = FastAPI(
     title="NicheExplorer Article Fetcher Service",
     version="1.0.0",
     description="Fetches articles from arXiv and Reddit based on queries",
+    lifespan=lifespan,
+    # Article lists with long summaries serialize noticeably faster via orjson
+    default_response_class=ORJSONResponse,
 )
 
 app.add_middleware(PrometheusMiddleware)
 app.add_route("/metrics", metrics)
 
+
 @app.exception_handler(RequestValidationError)
 async def validation_exception_handler(
     request: Request, exc: RequestValidationError
@@ -39,12 +76,101 @@ async def validation_exception_handler(
     )
 
 
-@app.post("/api/v1/articles", response_model=ArticleFetchResponse)
-async def fetch_articles(request: ArticleFetchRequest) -> ArticleFetchResponse:
+# ------------------------------------------------------------------
+# arXiv fallback chain
+# ------------------------------------------------------------------
+
+
+@lru_cache(maxsize=1024)
+def _arxiv_candidate_queries(
+    category: Optional[str], query: Optional[str]
+) -> Tuple[str, ...]:
+    """Return the arXiv queries to try, in priority order.
+
+    1) advanced query or plain category (cat:xyz)
+    2) category-only part of an advanced query
+    3) free-text query
+
+    Cached – the UI sends the same (category, query) pairs over and over.
+    """
+    # One scan finds every query operator present in the category string
+    tokens = set(_QUERY_TOKEN_RE.findall(category or ""))
+
+    # If category already looks like an advanced arXiv query (contains cat: or all:), use as-is
+    if tokens & {"cat:", "all:"}:
+        search_query = category
+    else:
+        # Plain category name provided → build simple category query; otherwise fall back to free-text
+        search_query = f"cat:{category}" if category else query
+    candidates = [search_query]
+
+    # Detect advanced form containing both phrase/all: and cat:
+    if "cat:" in tokens and tokens & {"all:", "AND"}:
+        # Extract the last category token after 'cat:' (handles URL-encoded '+' already replaced by Space)
+        candidates.append(f"cat:{category.split('cat:')[-1]}")
+
+    if query:
+        candidates.append(query)
+
+    # The same query never needs a second round trip
+    return tuple(dict.fromkeys(candidates))
+
+
+async def _fetch_first_non_empty(
+    candidates: Sequence[str], max_results: int
+) -> List[Article]:
+    """Return the articles of the first candidate query that yields any.
+
+    With SPECULATIVE_FALLBACK=1 all candidates are requested concurrently, so
+    an empty primary result costs one round trip instead of up to three;
+    lower-priority requests still running are cancelled once a result is
+    chosen. By default candidates are tried one after another to keep the
+    request rate to export.arxiv.org low.
+    """
+    if not SPECULATIVE_FALLBACK or len(candidates) == 1:
+        for i, query in enumerate(candidates):
+            if i:
+                logger.info("Previous arXiv query empty – retrying '%s'", query)
+            articles = await arxiv_fetcher.fetch(query=query, max_results=max_results)
+            if articles:
+                return articles
+        return []
+
+    tasks = [
+        asyncio.create_task(arxiv_fetcher.fetch(query=q, max_results=max_results))
+        for q in candidates
+    ]
+    try:
+        for query, task in zip(candidates, tasks):
+            try:
+                articles = await task
+            except Exception as e:
+                logger.warning("Speculative arXiv query '%s' failed: %s", query, e)
+                continue
+            if articles:
+                return articles
+        return []
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+# The handler serializes the body itself, so FastAPI must not validate it
+# against a response model; the schema is still documented for clients.
+@app.post(
+    "/api/v1/articles",
+    response_model=None,
+    responses={200: {"model": ArticleFetchResponse}},
+)
+async def fetch_articles(request: ArticleFetchRequest) -> Response:
     """Fetch articles from the specified source"""
     try:
         logger.info(
-            f"Received fetch request: source={request.source}, query={request.query}, category={request.category}, limit={request.limit}"
+            "Received fetch request: source=%s, query=%s, category=%s, limit=%s",
+            request.source,
+            request.query,
+            request.category,
+            request.limit,
         )
 
         # Determine how many articles to fetch (default to 50 if not provided)
@@ -54,58 +180,13 @@ async def fetch_articles(request: ArticleFetchRequest) -> ArticleFetchResponse:
         # Source-specific routing
         # ------------------------------------------------------------------
         if request.source == "arxiv":
-            # If category already looks like an advanced arXiv query (contains cat: or all:), use as-is
-            if request.category and (
-                "cat:" in request.category or "all:" in request.category
-            ):
-                search_query = request.category
-            else:
-                # Plain category name provided → build simple category query; otherwise fall back to free-text
-                search_query = (
-                    f"cat:{request.category}" if request.category else request.query
-                )
-            articles = await arxiv_fetcher.fetch(
-                query=search_query, max_results=max_results
-            )
-
-            # ------------------------------------------------------------------
-            # Multi-step fallback to avoid empty result sets
-            # 1) advanced query (already executed)
-            # 2) category-only (cat:xyz)
-            # 3) free-text query
-            # ------------------------------------------------------------------
-
-            if len(articles) == 0 and request.category:
-                # Detect advanced form containing both phrase/all: and cat:
-                if "cat:" in request.category and (
-                    "all:" in request.category or "AND" in request.category
-                ):
-                    # Extract the last category token after 'cat:' (handles URL-encoded '+' already replaced by Space)
-                    cat_part = request.category.split("cat:")[-1]
-                    fallback_query = f"cat:{cat_part}"
-                    logger.info(
-                        "Advanced query empty – retrying category-only '%s'",
-                        fallback_query,
-                    )
-                    articles = await arxiv_fetcher.fetch(
-                        query=fallback_query, max_results=max_results
-                    )
-
-            if len(articles) == 0:
-                free_text_query = request.query
-                if free_text_query:
-                    logger.info(
-                        "Category query empty – retrying free-text '%s'",
-                        free_text_query,
-                    )
-                    articles = await arxiv_fetcher.fetch(
-                        query=free_text_query, max_results=max_results
-                    )
+            candidates = _arxiv_candidate_queries(request.category, request.query)
+            articles = await _fetch_first_non_empty(candidates, max_results)
 
             if len(articles) == 0:
                 logger.warning(
                     "ArXiv query ultimately returned 0 results for original query '%s'",
-                    search_query,
+                    candidates[0],
                 )
         elif request.source == "reddit":
             # Treat `category` as subreddit (fallback to free-text query if absent)
@@ -118,26 +199,45 @@ async def fetch_articles(request: ArticleFetchRequest) -> ArticleFetchResponse:
                 status_code=400, detail=f"Unsupported source: {request.source}"
             )
 
-        logger.info(f"Fetched {len(articles)} articles from {request.source}")
+        logger.info("Fetched %d articles from %s", len(articles), request.source)
 
-        return ArticleFetchResponse(
+        # Articles were built by our own fetchers; only the request is untrusted
+        response = ArticleFetchResponse.model_construct(
             articles=articles, total_found=len(articles), source=request.source
         )
+        # Serialize straight to JSON bytes in pydantic-core instead of letting
+        # FastAPI re-validate the model and encode it a second time
+        return Response(
+            content=response.model_dump_json(by_alias=True),
+            media_type="application/json",
+        )
     except Exception as e:
-        logger.error(f"Failed to fetch articles: {str(e)}")
+        logger.error("Failed to fetch articles: %s", e)
         raise HTTPException(
             status_code=500, detail=f"Failed to fetch articles: {str(e)}"
         )
 
 
-@app.get("/api/v1/sources/{source}/categories")
-async def get_source_categories(source: str) -> Dict[str, List[str]]:
+@app.get(
+    "/api/v1/sources/{source}/categories",
+    response_model=None,
+    responses={200: {"model": Dict[str, List[str]]}},
+)
+async def get_source_categories(source: str, request: Request) -> Response:
     """Get available categories for a specific data source"""
     if source == "arxiv":
-        return ARVIX_CATEGORIES
+        if_none_match = request.headers.get("if-none-match", "")
+        etags = {tag.strip() for tag in if_none_match.split(",")}
+        if _ARXIV_CATEGORIES_HEADERS["ETag"] in etags or "*" in etags:
+            return Response(status_code=304, headers=_ARXIV_CATEGORIES_HEADERS)
+        return Response(
+            content=_ARXIV_CATEGORIES_JSON,
+            media_type="application/json",
+            headers=_ARXIV_CATEGORIES_HEADERS,
+        )
     elif source == "reddit":
         # Placeholder for Reddit categories
-        return {"Subreddits": ["AskReddit", "programming", "science"]}
+        return ORJSONResponse({"Subreddits": ["AskReddit", "programming", "science"]})
     else:
         raise HTTPException(status_code=404, detail=f"Source '{source}' not found.")
 
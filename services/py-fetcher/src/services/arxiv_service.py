@@ -3,12 +3,15 @@
 # ---------------------------------------------------------------------------
 
 import arxiv
-import requests
-import feedparser
-from datetime import datetime, timezone
-from typing import List
+import asyncio
+import threading
+from datetime import timezone
+from typing import Iterator, List
 from niche_explorer_models.models.article import Article
 from urllib.parse import quote
+from .feed_parser import iter_atom_entries, parse_atom_datetime
+from .fetch_cache import FetchCache
+from .http_client import get_http_client
 
 
 class ArxivFetcher:
@@ -26,56 +29,99 @@ class ArxivFetcher:
         self.client = arxiv.Client(
             page_size=page_size, num_retries=3, delay_seconds=1.0
         )
+        # arxiv.Client keeps its throttle state and requests session without
+        # locking, so only one worker thread may page through it at a time
+        self._client_lock = threading.Lock()
+        # Popular category queries repeat often; serve them without another
+        # throttled round trip to arXiv for a few minutes. Empty answers are
+        # kept for a minute so an empty category does not cost its full
+        # fallback chain on every request.
+        self._cache = FetchCache(maxsize=512, ttl=300, negative_ttl=60)
 
     async def fetch(self, query: str, max_results: int = 50) -> List[Article]:
+        return await self._cache.get_or_fetch(
+            (query, max_results), lambda: self._fetch_uncached(query, max_results)
+        )
+
+    async def _fetch_uncached(self, query: str, max_results: int) -> List[Article]:
         import logging
 
         logger = logging.getLogger(__name__)
 
+        stop = threading.Event()
         try:
-            search = arxiv.Search(query=query, max_results=max_results)
-            results = list(self.client.results(search))
+            # The arxiv client pages with blocking requests and sleeps between
+            # them to honour the rate limit – drain it in a worker thread
+            articles = await asyncio.to_thread(self._drain, query, max_results, stop)
+        except asyncio.CancelledError:
+            # The thread itself cannot be interrupted; stop it before its next page
+            stop.set()
+            raise
         except arxiv.ArxivError as err:
             logger.warning(
                 "arxiv library error for '%s' – %s. Falling back to HTTP API.",
                 query,
                 err,
             )
-            results = []
+            articles = []
 
         # If the primary attempt yielded no results, fall back to direct HTTP API call.
-        if len(results) == 0:
+        if len(articles) == 0:
             logger.info(
                 "No arxiv-library results for '%s'. Falling back to export.arxiv.org API",
                 query,
             )
             return await self._fetch_via_http_api(query, max_results)
 
-        return [self._map_result(r) for r in results]
+        return articles
 
-    # ------------------------------------------------------------------
-    # Internal helpers
-    # ------------------------------------------------------------------
+    def _drain(
+        self, query: str, max_results: int, stop: threading.Event
+    ) -> List[Article]:
+        """Collect `iter_articles` while holding the client lock.
 
-    def _map_result(self, res: arxiv.Result) -> Article:
-        # Ensure timezone-aware datetime (UTC) for JSON serialisation
-        published = res.published
-        if published and published.tzinfo is None:
-            published = published.replace(tzinfo=timezone.utc)
-
-        return Article(
-            id=res.get_short_id(),
-            title=res.title,
-            link=res.entry_id,
-            summary=res.summary,
-            authors=[a.name for a in res.authors],
-            published=published,
-            source="arxiv",
-        )
+        Returns early (with what it has) once `stop` is set, so an abandoned
+        query does not keep paging arXiv.
+        """
+        articles: List[Article] = []
+        with self._client_lock:
+            if stop.is_set():
+                return articles
+            for article in self.iter_articles(query, max_results):
+                if stop.is_set():
+                    break
+                articles.append(article)
+        return articles
+
+    def iter_articles(self, query: str, max_results: int = 50) -> Iterator[Article]:
+        """Lazily yield mapped articles as the arxiv client pages through results.
+
+        Consumers can start processing the first page while later pages are
+        still being fetched. Raises `arxiv.ArxivError` on library failures.
+        """
+        search = arxiv.Search(query=query, max_results=max_results)
+        # Bound once per search rather than looked up per result
+        construct = Article.model_construct
+        utc = timezone.utc
+        for res in self.client.results(search):
+            published = res.published
+            # Ensure timezone-aware datetime (UTC) for JSON serialisation
+            if published is not None and published.tzinfo is None:
+                published = published.replace(tzinfo=utc)
+            # Fields come straight from typed arxiv.Result attributes – skip validation
+            yield construct(
+                id=res.get_short_id(),
+                title=res.title,
+                link=res.entry_id,
+                summary=res.summary,
+                authors=[a.name for a in res.authors],
+                published=published,
+                source="arxiv",
+            )
 
     # ------------------------------------------------------------------
-    # Fallback via raw HTTP request (XML feed) – synchronous call inside async
-    # context is acceptable for this lightweight service.
+    # Fallback via raw HTTP request (XML feed) on the shared async client,
+    # so the event loop keeps serving other requests during the round trip.
     # ------------------------------------------------------------------
 
     async def _fetch_via_http_api(self, query: str, max_results: int) -> List[Article]:
@@ -91,31 +137,21 @@ class ArxivFetcher:
             f"&sortBy=relevance&sortOrder=descending&start=0&max_results={max_results}"
         )
 
-        resp = requests.get(url, timeout=30)
+        resp = await get_http_client().get(url, timeout=30)
         resp.raise_for_status()
 
-        feed = feedparser.parse(resp.text)
+        # Parsing up to max_results entries is CPU-bound – keep it off the event loop
+        entries = await asyncio.to_thread(list, iter_atom_entries(resp.content))
         articles: List[Article] = []
-        for entry in feed.entries:
-            published = None
-            if hasattr(entry, "published"):
-                try:
-                    published = datetime.strptime(
-                        entry.published, "%Y-%m-%dT%H:%M:%SZ"
-                    ).replace(tzinfo=timezone.utc)
-                except Exception:
-                    published = None
-
+        for entry in entries:
             articles.append(
-                Article(
-                    id=entry.id.split("/")[-1],
-                    title=entry.title,
-                    link=entry.id,
-                    summary=entry.summary,
-                    authors=[a.name for a in entry.authors]
-                    if hasattr(entry, "authors")
-                    else [],
-                    published=published,
+                Article.model_construct(
+                    id=entry["id"].split("/")[-1],
+                    title=entry["title"],
+                    link=entry["id"],
+                    summary=entry["summary"],
+                    authors=entry["authors"],
+                    published=parse_atom_datetime(entry["published"]),
                     source="arxiv",
                 )
             )
@@ -0,0 +1,106 @@
+# ---------------------------------------------------------------------------
+# Minimal Atom feed parsing shared by the arXiv and Reddit fetchers
+# ---------------------------------------------------------------------------
+
+import io
+from datetime import datetime
+from typing import Iterator, List, Optional, TypedDict
+
+from lxml import etree
+
+ATOM_NS = "http://www.w3.org/2005/Atom"
+_ENTRY = f"{{{ATOM_NS}}}entry"
+_ID = f"{{{ATOM_NS}}}id"
+_TITLE = f"{{{ATOM_NS}}}title"
+_LINK = f"{{{ATOM_NS}}}link"
+_SUMMARY = f"{{{ATOM_NS}}}summary"
+_CONTENT = f"{{{ATOM_NS}}}content"
+_PUBLISHED = f"{{{ATOM_NS}}}published"
+_UPDATED = f"{{{ATOM_NS}}}updated"
+_AUTHOR_NAME = f"{{{ATOM_NS}}}author/{{{ATOM_NS}}}name"
+
+# Feeds come from remote hosts: never expand entities or fetch external DTDs
+_PARSER_OPTIONS = {"resolve_entities": False, "no_network": True}
+
+
+class FeedEntry(TypedDict):
+    id: str
+    title: str
+    link: str
+    summary: str
+    authors: List[str]
+    published: Optional[str]
+    updated: Optional[str]
+
+
+def iter_atom_entries(content: bytes) -> Iterator[FeedEntry]:
+    """Yield the fields we use from each `<entry>` of an Atom document.
+
+    Streams over the raw response bytes with `iterparse` instead of building
+    the whole tree, and clears every entry once it has been read.
+    """
+    for _, elem in etree.iterparse(io.BytesIO(content), tag=_ENTRY, **_PARSER_OPTIONS):
+        yield _read_entry(elem)
+        _release(elem)
+
+
+class AtomEntryReader:
+    """Incremental Atom parser for response bodies that arrive in chunks.
+
+    Lets callers stop reading the network stream as soon as they have
+    enough entries.
+    """
+
+    def __init__(self):
+        self._parser = etree.XMLPullParser(
+            events=("end",), tag=_ENTRY, **_PARSER_OPTIONS
+        )
+
+    def feed(self, chunk: bytes) -> List[FeedEntry]:
+        """Parse `chunk` and return the entries it completed."""
+        self._parser.feed(chunk)
+        entries = []
+        for _, elem in self._parser.read_events():
+            entries.append(_read_entry(elem))
+            _release(elem)
+        return entries
+
+
+def _read_entry(elem: etree._Element) -> FeedEntry:
+    entry_id = (elem.findtext(_ID) or "").strip()
+    link = entry_id
+    for link_elem in elem.iterfind(_LINK):
+        if link_elem.get("rel", "alternate") == "alternate":
+            link = link_elem.get("href", link)
+            break
+
+    summary = elem.findtext(_SUMMARY)
+    if summary is None:
+        summary = elem.findtext(_CONTENT, "")
+
+    return FeedEntry(
+        id=entry_id,
+        title=elem.findtext(_TITLE, ""),
+        link=link,
+        summary=summary,
+        authors=[name.text or "" for name in elem.iterfind(_AUTHOR_NAME)],
+        published=elem.findtext(_PUBLISHED),
+        updated=elem.findtext(_UPDATED),
+    )
+
+
+def _release(elem: etree._Element) -> None:
+    """Free a processed entry (and already-processed siblings)."""
+    elem.clear()
+    while elem.getprevious() is not None:
+        del elem.getparent()[0]
+
+
+def parse_atom_datetime(value: Optional[str]) -> Optional[datetime]:
+    """Parse an RFC 3339 timestamp (`...Z` or `...+00:00`); None if invalid."""
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value.strip())
+    except ValueError:
+        return None
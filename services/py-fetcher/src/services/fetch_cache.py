@@ -0,0 +1,73 @@
+# ---------------------------------------------------------------------------
+# Short-lived result cache shared by the arXiv and Reddit fetchers
+# ---------------------------------------------------------------------------
+
+import asyncio
+from typing import Awaitable, Callable, Dict, Hashable, List, Optional, TypeVar
+
+from cachetools import TTLCache
+
+T = TypeVar("T")
+
+
+class FetchCache:
+    """TTL cache for fetch results with request coalescing.
+
+    Concurrent misses for the same key share one upstream request instead of
+    each hitting the feed host. Non-empty results live for ``ttl`` seconds.
+    Empty results are only remembered for ``negative_ttl`` seconds (never,
+    by default), so a query that comes back empty is not re-sent on every
+    request but is retried soon after.
+    """
+
+    def __init__(self, maxsize: int = 512, ttl: float = 300, negative_ttl: float = 0):
+        self._cache: TTLCache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._empty: Optional[TTLCache] = (
+            TTLCache(maxsize=maxsize, ttl=negative_ttl) if negative_ttl > 0 else None
+        )
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+        # Callers currently awaiting each in-flight key
+        self._waiters: Dict[Hashable, int] = {}
+
+    async def get_or_fetch(
+        self, key: Hashable, fetch: Callable[[], Awaitable[List[T]]]
+    ) -> List[T]:
+        cached = self._cache.get(key)
+        if cached is not None:
+            # Hand out a copy so callers cannot mutate the cached list
+            return list(cached)
+        if self._empty is not None and key in self._empty:
+            return []
+
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._fetch_and_store(key, fetch))
+            self._inflight[key] = task
+        self._waiters[key] = self._waiters.get(key, 0) + 1
+        cancelled = False
+        try:
+            # A cancelled caller must not cancel the request other callers share
+            return list(await asyncio.shield(task))
+        except asyncio.CancelledError:
+            cancelled = True
+            raise
+        finally:
+            remaining = self._waiters.pop(key) - 1
+            if remaining:
+                self._waiters[key] = remaining
+            elif cancelled and not task.done():
+                # Nobody wants the result any more – abandon the upstream request
+                task.cancel()
+
+    async def _fetch_and_store(
+        self, key: Hashable, fetch: Callable[[], Awaitable[List[T]]]
+    ) -> List[T]:
+        try:
+            result = await fetch()
+            if result:
+                self._cache[key] = list(result)
+            elif self._empty is not None:
+                self._empty[key] = True
+            return result
+        finally:
+            self._inflight.pop(key, None)
@@ -0,0 +1,40 @@
+# ---------------------------------------------------------------------------
+# Shared async HTTP client for outbound feed requests
+# ---------------------------------------------------------------------------
+
+import httpx
+
+# Reddit rejects requests that use a generic client User-Agent
+USER_AGENT = "NicheExplorer-ArticleFetcher/1.0"
+
+_client: httpx.AsyncClient | None = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Return the process-wide AsyncClient, creating it on first use.
+
+    A single pooled client keeps TCP/TLS connections to the feed hosts alive
+    across requests instead of re-handshaking on every fetch.
+    """
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            timeout=httpx.Timeout(10.0, connect=5.0),
+            # Pool limits live on the transport; it also retries failed
+            # connection attempts (not responses) before giving up
+            transport=httpx.AsyncHTTPTransport(
+                retries=3,
+                limits=httpx.Limits(max_connections=32, max_keepalive_connections=32),
+            ),
+            follow_redirects=True,
+            headers={"User-Agent": USER_AGENT},
+        )
+    return _client
+
+
+async def aclose_http_client() -> None:
+    """Close the shared client (called on application shutdown)."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
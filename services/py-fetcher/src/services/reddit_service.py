@@ -1,35 +1,52 @@
-import feedparser
+import logging
+import httpx
 from typing import List
-from datetime import datetime
 from niche_explorer_models.models.article import Article
+from .fetch_cache import FetchCache
+from .feed_parser import AtomEntryReader, FeedEntry, parse_atom_datetime
+from .http_client import get_http_client
+
+logger = logging.getLogger(__name__)
 
 
 class RedditFetcher:
+    def __init__(self):
+        self._cache = FetchCache(maxsize=512, ttl=300)
+
     async def fetch(self, subreddit: str, max_results: int = 50) -> List[Article]:
+        return await self._cache.get_or_fetch(
+            (subreddit, max_results),
+            lambda: self._fetch_uncached(subreddit, max_results),
+        )
+
+    async def _fetch_uncached(self, subreddit: str, max_results: int) -> List[Article]:
         url = f"https://www.reddit.com/r/{subreddit}.rss"
-        feed = feedparser.parse(url)
+        reader = AtomEntryReader()
+        entries: List[FeedEntry] = []
+        try:
+            # Stream the body and stop reading once enough entries are parsed;
+            # leaving the block closes the response early
+            async with get_http_client().stream("GET", url) as resp:
+                resp.raise_for_status()
+                async for chunk in resp.aiter_bytes():
+                    entries.extend(reader.feed(chunk))
+                    if len(entries) >= max_results:
+                        break
+        except httpx.HTTPError as e:
+            logger.warning("Reddit feed request for r/%s failed: %s", subreddit, e)
+            return []
+
         articles = []
-        for entry in feed.entries[:max_results]:
-            # Parse published date if available
-            published = None
-            if entry.get("published_parsed"):
-                try:
-                    published = datetime(*entry.published_parsed[:6])
-                except Exception:
-                    pass
+        for entry in entries[:max_results]:
             # Fallback to updated if published is not available
-            elif entry.get("updated_parsed"):
-                try:
-                    published = datetime(*entry.updated_parsed[:6])
-                except Exception:
-                    pass
+            published = parse_atom_datetime(entry["published"] or entry["updated"])
 
             articles.append(
-                Article(
-                    id=entry.id,
-                    title=entry.title,
-                    link=entry.link,
-                    summary=entry.summary,
+                Article.model_construct(
+                    id=entry["id"],
+                    title=entry["title"],
+                    link=entry["link"],
+                    summary=entry["summary"],
                     authors=[],  # Reddit posts don't have traditional authors
                     published=published,
                     source="reddit",
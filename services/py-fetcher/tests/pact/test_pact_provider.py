@@ -6,12 +6,16 @@ defined by the api-server consumer test.
 """
 
 import pytest
-import subprocess
+import socket
+import threading
 import time
-import requests
 import os
+import uvicorn
 from pact import Verifier
 from unittest.mock import MagicMock, AsyncMock
+from niche_explorer_models.models.article import Article
+
+from src.main import app
 
 # Define the expected location of the contract file
 PACT_FILE = os.path.join(
@@ -20,6 +24,15 @@ PACT_FILE = os.path.join(
 )
 
 
+def _free_port() -> int:
+    """Ask the OS for an unused port so parallel workers never collide."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+# Keep all provider checks on one xdist worker so they share one server
+@pytest.mark.xdist_group("pact")
 class TestPyFetcherProvider:
     """
     Provider test that verifies py-fetcher satisfies the contract
@@ -29,59 +42,53 @@ class TestPyFetcherProvider:
     @pytest.fixture(scope="module")
     def provider_service(self):
         """
-        Spins up the py-fetcher service as a separate process for the Verifier to use.
+        Runs the py-fetcher app in-process on a uvicorn server thread for the
+        Verifier to use. Unlike a subprocess, this skips interpreter start-up
+        and lets the mocks patched by the provider states take effect.
         """
-        process = subprocess.Popen(
-            [
-                "python",
-                "-m",
-                "uvicorn",
-                "src.main:app",
-                "--host",
-                "127.0.0.1",
-                "--port",
-                "8200",  # As defined for py-fetcher
-            ],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
+        port = _free_port()
+        base_url = f"http://127.0.0.1:{port}"
+        config = uvicorn.Config(
+            app,
+            host="127.0.0.1",
+            port=port,
+            log_level="warning",
+            lifespan="on",
         )
-
-        def _wait_for_service(url, timeout=30):
-            start_time = time.time()
-            while time.time() - start_time < timeout:
-                try:
-                    response = requests.get(url, timeout=5)
-                    if response.status_code == 200:
-                        print("Provider service started successfully.")
-                        return
-                except requests.exceptions.ConnectionError:
-                    time.sleep(1)
-            # If the loop finishes, the service did not start
-            stdout, stderr = process.communicate()
-            raise Exception(
-                f"Provider service at {url} did not start within {timeout} seconds.\\n"
-                f"STDOUT: {stdout.decode()}\\n"
-                f"STDERR: {stderr.decode()}"
-            )
-
-        # Use the health check endpoint to wait for the service
-        _wait_for_service("http://127.0.0.1:8200/health")
-        yield "http://127.0.0.1:8200"
-
-        print("Terminating provider service...")
-        process.terminate()
-        process.wait()
-
-    def test_against_api_server_contract(self, provider_service, mocker):
-        """
-        Validates that the py-fetcher provider meets the contract defined by the api-server consumer.
-        """
+        server = uvicorn.Server(config)
+        thread = threading.Thread(target=server.run, daemon=True)
+        thread.start()
+
+        # `started` flips once the socket is accepting connections
+        deadline = time.monotonic() + 30
+        while not server.started:
+            if not thread.is_alive() or time.monotonic() > deadline:
+                raise Exception(f"Provider service at {base_url} did not start.")
+            time.sleep(0.01)
+        yield base_url
+
+        server.should_exit = True
+        thread.join(timeout=2)
+
+    @pytest.fixture(scope="session")
+    def pact_path(self):
+        """Checks once per session that the consumer contract has been generated."""
         if not os.path.exists(PACT_FILE):
             pytest.fail(
                 f"Pact file not found at {os.path.abspath(PACT_FILE)}. "
                 "Please run the consumer test in 'spring-api' first to generate it."
             )
+        return PACT_FILE
+
+    @pytest.fixture(scope="module")
+    def verifier(self, provider_service):
+        """One Verifier shared by every contract check against the provider."""
+        return Verifier(provider="py-fetcher", provider_base_url=provider_service)
 
+    def test_against_api_server_contract(self, verifier, pact_path, mocker):
+        """
+        Validates that the py-fetcher provider meets the contract defined by the api-server consumer.
+        """
         # Mock the internal service to avoid real calls to arXiv during verification
         mock_fetch_service = mocker.patch(
             "src.main.arxiv_fetcher", new_callable=MagicMock
@@ -91,7 +98,14 @@ class TestPyFetcherProvider:
             """Provider state: the fetcher is ready."""
             # This state is simple, but we can configure mock returns here
             mock_fetch_service.fetch = AsyncMock(
-                return_value=[MagicMock(id="123", title="Mocked Paper", source="arxiv")]
+                return_value=[
+                    Article(
+                        id="123",
+                        title="Mocked Paper",
+                        link="http://arxiv.org/abs/123",
+                        source="arxiv",
+                    )
+                ]
             )
             return True
 
@@ -105,10 +119,8 @@ class TestPyFetcherProvider:
             "the article fetcher has categories available for source arxiv": fetcher_has_arxiv_categories,
         }
 
-        verifier = Verifier(provider="py-fetcher", provider_base_url=provider_service)
-
         success, logs = verifier.verify_pacts(
-            PACT_FILE,
+            pact_path,
             provider_states=provider_states,
             verbose=True,
         )
@@ -5,7 +5,12 @@ from unittest.mock import MagicMock, AsyncMock, patch
 from src.main import app
 from niche_explorer_models.models.article import Article
 
-client = TestClient(app)
+
+@pytest.fixture(scope="session")
+def client():
+    """One TestClient (and one lifespan startup/shutdown) for the whole session."""
+    with TestClient(app) as test_client:
+        yield test_client
 
 
 @pytest.fixture
@@ -16,7 +21,7 @@ def mock_fetcher():
         yield mock
 
 
-def test_fetch_articles_success(mock_fetcher):
+def test_fetch_articles_success(client, mock_fetcher):
     """
     Tests POST /api/v1/articles successfully.
     Verifies that the endpoint correctly calls the service and returns a 200 OK.
@@ -40,7 +45,7 @@ def test_fetch_articles_success(mock_fetcher):
     mock_fetcher.fetch.assert_awaited_once_with(query="cat:cs.AI", max_results=10)
 
 
-def test_fetch_articles_unsupported_source():
+def test_fetch_articles_unsupported_source(client):
     """
     Tests that a 400 is returned for an unsupported source, as per openapi.yaml.
     """
@@ -54,7 +59,7 @@ def test_fetch_articles_unsupported_source():
     assert response.status_code == 422  # FastAPI's validation for enums handles this
 
 
-def test_get_arxiv_categories():
+def test_get_arxiv_categories(client):
     """
     Tests GET /api/v1/sources/arxiv/categories.
     """
@@ -69,7 +74,26 @@ def test_get_arxiv_categories():
     assert "cs.AI" in json_data["Computer Science"]
 
 
-def test_get_categories_unsupported_source():
+def test_get_arxiv_categories_revalidates_with_etag(client):
+    """
+    Tests that a matching If-None-Match gets a bodyless 304.
+    """
+    # Arrange
+    etag = client.get("/api/v1/sources/arxiv/categories").headers["ETag"]
+
+    # Act
+    response = client.get(
+        "/api/v1/sources/arxiv/categories", headers={"If-None-Match": etag}
+    )
+
+    # Assert
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["ETag"] == etag
+    assert "max-age" in response.headers["Cache-Control"]
+
+
+def test_get_categories_unsupported_source(client):
     """
     Tests that a 404 is returned for a source with no categories defined.
     """
@@ -79,3 +103,57 @@ def test_get_categories_unsupported_source():
     # Assert
     assert response.status_code == 404
     assert "Source 'unsupported' not found." in response.json()["detail"]
+
+
+def test_fetch_articles_falls_back_to_category_then_free_text(client, mock_fetcher):
+    """
+    Tests that empty results walk the fallback chain in priority order.
+    """
+    # Arrange
+    request_body = {
+        "query": "vision transformers",
+        "category": 'all:"vision"+AND+cat:cs.CV',
+        "limit": 5,
+        "source": "arxiv",
+    }
+    mock_article = Article(
+        id="123", title="Test", link="http://example.com", source="arxiv"
+    )
+    mock_fetcher.fetch.side_effect = [[], [], [mock_article]]
+
+    # Act
+    response = client.post("/api/v1/articles", json=request_body)
+
+    # Assert
+    assert response.status_code == 200
+    assert response.json()["total_found"] == 1
+    queries = [c.kwargs["query"] for c in mock_fetcher.fetch.await_args_list]
+    assert queries == ['all:"vision"+AND+cat:cs.CV', "cat:cs.CV", "vision transformers"]
+
+
+def test_fetch_articles_speculative_fallback_prefers_primary(
+    client, mock_fetcher, mocker
+):
+    """
+    Tests that speculative mode requests all candidates at once but still
+    returns the highest-priority non-empty result.
+    """
+    # Arrange
+    mocker.patch("src.main.SPECULATIVE_FALLBACK", True)
+    request_body = {
+        "query": "vision transformers",
+        "category": "cs.CV",
+        "limit": 5,
+        "source": "arxiv",
+    }
+    primary = Article(id="1", title="Primary", link="http://a.com", source="arxiv")
+    fallback = Article(id="2", title="Fallback", link="http://b.com", source="arxiv")
+    mock_fetcher.fetch.side_effect = [[primary], [fallback]]
+
+    # Act
+    response = client.post("/api/v1/articles", json=request_body)
+
+    # Assert
+    assert response.status_code == 200
+    assert [a["id"] for a in response.json()["articles"]] == ["1"]
+    assert mock_fetcher.fetch.call_count == 2
@@ -1,9 +1,15 @@
+import asyncio
+import threading
+import time
+
 import pytest
-from unittest.mock import MagicMock, patch, AsyncMock
+from unittest.mock import patch, AsyncMock
 import datetime
+from types import SimpleNamespace
 from src.services.arxiv_service import ArxivFetcher
 import arxiv
-import requests
+import httpx
+import respx
 from freezegun import freeze_time
 
 
@@ -15,19 +21,17 @@ def fetcher():
 
 @pytest.fixture
 def mock_arxiv_result():
-    """Creates a mock arxiv.Result object."""
-    result = MagicMock(spec=arxiv.Result)
-    result.get_short_id.return_value = "2301.12345"
-    result.entry_id = "http://arxiv.org/abs/2301.12345v1"
-    result.title = "Test Paper Title"
-    result.summary = "This is a summary of the test paper."
-    author_mock = MagicMock()
-    author_mock.name = "John Doe"
-    result.authors = [author_mock]
-    result.published = datetime.datetime(
-        2023, 1, 15, 12, 0, 0, tzinfo=datetime.timezone.utc
+    """Creates a stand-in for an arxiv.Result with only the fields we read."""
+    return SimpleNamespace(
+        get_short_id=lambda: "2301.12345",
+        entry_id="http://arxiv.org/abs/2301.12345v1",
+        title="Test Paper Title",
+        summary="This is a summary of the test paper.",
+        authors=[SimpleNamespace(name="John Doe")],
+        published=datetime.datetime(
+            2023, 1, 15, 12, 0, 0, tzinfo=datetime.timezone.utc
+        ),
     )
-    return result
 
 
 @pytest.mark.asyncio
@@ -100,14 +104,13 @@ async def test_fetch_fallback_on_arxiv_error(fetcher, mocker):
 
 @pytest.mark.asyncio
 @freeze_time("2023-10-27")
-async def test_http_fallback_parsing(fetcher, mocker):
+@respx.mock
+async def test_http_fallback_parsing(fetcher):
     """
     Tests the parsing logic of the raw XML feed from the HTTP fallback.
     """
     # Arrange
-    mock_response = MagicMock(spec=requests.Response)
-    mock_response.status_code = 200
-    mock_response.text = """<?xml version="1.0" encoding="UTF-8"?>
+    xml = b"""<?xml version="1.0" encoding="UTF-8"?>
     <feed xmlns="http://www.w3.org/2005/Atom">
       <entry>
         <id>http://arxiv.org/abs/2310.12345v1</id>
@@ -117,7 +120,9 @@ async def test_http_fallback_parsing(fetcher, mocker):
         <published>2023-10-27T10:00:00Z</published>
       </entry>
     </feed>"""
-    mocker.patch("requests.get", return_value=mock_response)
+    route = respx.get(url__startswith="https://export.arxiv.org/api/query").mock(
+        return_value=httpx.Response(200, content=xml)
+    )
 
     # Act
     articles = await fetcher._fetch_via_http_api("all:test", 1)
@@ -133,3 +138,114 @@ async def test_http_fallback_parsing(fetcher, mocker):
         2023, 10, 27, 10, 0, 0, tzinfo=datetime.timezone.utc
     )
     assert article.source == "arxiv"
+    assert route.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_fetch_serves_repeated_queries_from_cache(fetcher, mock_arxiv_result):
+    """
+    Tests that identical queries within the TTL only hit arXiv once.
+    """
+    # Arrange
+    with patch.object(
+        fetcher.client, "results", return_value=[mock_arxiv_result]
+    ) as mock_results:
+        # Act
+        first = await fetcher.fetch("cat:cs.AI", max_results=1)
+        second = await fetcher.fetch("cat:cs.AI", max_results=1)
+
+        # Assert
+        mock_results.assert_called_once()
+        assert [a.id for a in first] == [a.id for a in second] == ["2301.12345"]
+        assert first is not second
+
+
+@pytest.mark.asyncio
+async def test_concurrent_fetches_page_arxiv_one_at_a_time(fetcher, mock_arxiv_result):
+    """
+    Tests that concurrent queries never drive the shared arxiv client from two
+    worker threads at once (its rate-limit state is not thread-safe).
+    """
+    # Arrange
+    active = peak = 0
+    counter_lock = threading.Lock()
+
+    def results(search):
+        nonlocal active, peak
+        with counter_lock:
+            active += 1
+            peak = max(peak, active)
+        time.sleep(0.05)
+        with counter_lock:
+            active -= 1
+        return [mock_arxiv_result]
+
+    with patch.object(fetcher.client, "results", side_effect=results):
+        # Act
+        first, second = await asyncio.gather(
+            fetcher.fetch("cat:cs.AI", max_results=1),
+            fetcher.fetch("cat:cs.CV", max_results=1),
+        )
+
+    # Assert
+    assert peak == 1
+    assert len(first) == len(second) == 1
+
+
+@pytest.mark.asyncio
+async def test_cancelled_fetch_stops_paging(fetcher, mock_arxiv_result):
+    """
+    Tests that cancelling the only caller stops the worker thread before it
+    requests further pages.
+    """
+    # Arrange
+    first_page_started = threading.Event()
+    release_first_page = threading.Event()
+    pages_served = []
+
+    def results(search):
+        for page in range(3):
+            if page == 0:
+                first_page_started.set()
+                release_first_page.wait(timeout=5)
+            pages_served.append(page)
+            yield mock_arxiv_result
+
+    with patch.object(fetcher.client, "results", side_effect=results):
+        task = asyncio.create_task(fetcher.fetch("cat:cs.AI", max_results=3))
+        await asyncio.to_thread(first_page_started.wait, 5)
+
+        # Act
+        task.cancel()
+        await asyncio.sleep(0)
+        release_first_page.set()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        # Let the worker thread notice the stop flag and return
+        async with asyncio.timeout(5):
+            while fetcher._client_lock.locked():
+                await asyncio.sleep(0.01)
+
+    # Assert
+    assert pages_served == [0]
+
+
+@pytest.mark.asyncio
+async def test_fetch_remembers_empty_results_briefly(fetcher):
+    """
+    Tests that a query which just came back empty is not sent to arXiv again
+    while its negative cache entry is fresh.
+    """
+    # Arrange
+    with patch.object(fetcher.client, "results", return_value=[]) as mock_results:
+        with patch.object(
+            fetcher, "_fetch_via_http_api", new_callable=AsyncMock, return_value=[]
+        ) as mock_http:
+            # Act
+            first = await fetcher.fetch("cat:cs.XX", max_results=5)
+            second = await fetcher.fetch("cat:cs.XX", max_results=5)
+
+            # Assert
+            assert first == second == []
+            mock_results.assert_called_once()
+            mock_http.assert_awaited_once_with("cat:cs.XX", 5)
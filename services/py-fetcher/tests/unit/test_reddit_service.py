@@ -0,0 +1,107 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+import httpx
+from src.services.reddit_service import RedditFetcher
+
+REDDIT_FEED = b"""<?xml version="1.0" encoding="UTF-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom">
+  <entry>
+    <id>t3_abc123</id>
+    <title>Post about vision transformers</title>
+    <link href="https://www.reddit.com/r/computervision/comments/abc123/"/>
+    <content type="html">Body of the post.</content>
+    <updated>2023-10-27T10:00:00+00:00</updated>
+  </entry>
+</feed>"""
+
+
+@pytest.fixture
+def fetcher():
+    """Provides a clean RedditFetcher instance for each test."""
+    return RedditFetcher()
+
+
+def _streamed_response(chunks):
+    """Builds a mock `client.stream(...)` context whose body arrives in chunks."""
+
+    async def aiter_bytes():
+        for chunk in chunks:
+            yield chunk
+
+    response = MagicMock()
+    response.aiter_bytes = aiter_bytes
+    stream_ctx = MagicMock()
+    stream_ctx.__aenter__ = AsyncMock(return_value=response)
+    stream_ctx.__aexit__ = AsyncMock(return_value=False)
+    return stream_ctx
+
+
+@pytest.fixture
+def mock_http_client(mocker):
+    """Patches the shared HTTP client used by the Reddit fetcher."""
+    client = MagicMock()
+    mocker.patch("src.services.reddit_service.get_http_client", return_value=client)
+    return client
+
+
+@pytest.mark.asyncio
+async def test_fetch_parses_feed(fetcher, mock_http_client):
+    """
+    Tests that the subreddit feed is fetched via the shared client and parsed.
+    """
+    # Arrange
+    mock_http_client.stream.return_value = _streamed_response(
+        [REDDIT_FEED[:100], REDDIT_FEED[100:]]
+    )
+
+    # Act
+    articles = await fetcher.fetch("computervision", max_results=5)
+
+    # Assert
+    mock_http_client.stream.assert_called_once_with(
+        "GET", "https://www.reddit.com/r/computervision.rss"
+    )
+    assert len(articles) == 1
+    assert articles[0].id == "t3_abc123"
+    assert articles[0].title == "Post about vision transformers"
+    assert articles[0].source == "reddit"
+
+
+@pytest.mark.asyncio
+async def test_fetch_returns_empty_on_http_error(fetcher, mock_http_client):
+    """
+    Tests that network errors yield an empty result instead of raising.
+    """
+    # Arrange
+    mock_http_client.stream.side_effect = httpx.ConnectError("unreachable")
+
+    # Act
+    articles = await fetcher.fetch("computervision")
+
+    # Assert
+    assert articles == []
+
+
+@pytest.mark.asyncio
+async def test_fetch_stops_reading_after_max_results(fetcher, mock_http_client):
+    """
+    Tests that the body stream is abandoned once enough entries are parsed.
+    """
+    # Arrange
+    entry = REDDIT_FEED[REDDIT_FEED.index(b"<entry>") : REDDIT_FEED.index(b"</feed>")]
+    head = REDDIT_FEED[: REDDIT_FEED.index(b"<entry>")]
+    consumed = []
+
+    def chunks():
+        for chunk in (head + entry, entry, entry + b"</feed>"):
+            consumed.append(chunk)
+            yield chunk
+
+    mock_http_client.stream.return_value = _streamed_response(chunks())
+
+    # Act
+    articles = await fetcher.fetch("computervision", max_results=1)
+
+    # Assert
+    assert len(articles) == 1
+    assert len(consumed) == 1
@@ -1,23 +1,39 @@
-import os
+from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from .routers import classification, embedding, arxiv, generation
 from starlette_prometheus import metrics, PrometheusMiddleware
+from .services.embedding_service import close_embedding_service
+from .services.openweb_client import aclose_async_client
+from .settings import settings
 
 # Check if the key exists. If not, raise an error to stop the app.
-if not os.getenv("CHAIR_API_KEY"):
+if not settings.CHAIR_API_KEY:
     raise ValueError("FATAL ERROR: The CHAIR_API_KEY environment variable is not set.")
 
 # Check if the key exists. If not, raise an error to stop the app.
-if not os.getenv("GOOGLE_API_KEY"):
+if not settings.GOOGLE_API_KEY:
     raise ValueError("FATAL ERROR: The GOOGLE_API_KEY environment variable is not set.")
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # Release the pgvector connection held by the embedding service
+    close_embedding_service()
+    # Release pooled connections to OpenWebUI
+    await aclose_async_client()
+
+
 # Initialize FastAPI app with metadata matching OpenAPI spec
 app = FastAPI(
     title="NicheExplorer GenAI Service",
     version="1.0.0",
     description="Microservice for GenAI tasks like classification and query generation.",
+    lifespan=lifespan,
+    # Embedding responses carry large float arrays – orjson serializes them much faster
+    default_response_class=ORJSONResponse,
 )
 
 app.add_middleware(PrometheusMiddleware)
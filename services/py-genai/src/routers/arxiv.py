@@ -1,5 +1,7 @@
 import logging
-from fastapi import APIRouter, HTTPException, Path, Body
+from typing import Callable, Dict, Tuple
+
+from fastapi import APIRouter, HTTPException, Path
 from niche_explorer_models.models.query_builder_request import QueryBuilderRequest
 from niche_explorer_models.models.query_builder_response import QueryBuilderResponse
 from ..services.query_generation_service import query_service
@@ -10,44 +12,57 @@ logger = logging.getLogger(__name__)
 router = APIRouter(prefix="", tags=["AI"])
 
 
+def _build_arxiv(req_obj: QueryBuilderRequest) -> Tuple[str, str]:
+    """Build an arXiv query (search terms restricted to one category)."""
+    category = (
+        req_obj.filters.category
+        if req_obj.filters and req_obj.filters.category
+        else "cs.CV"
+    )
+    query = query_service.build_advanced_query(req_obj.search_terms, category)
+    description = (
+        f"Advanced arXiv search for '{req_obj.search_terms}' in category {category}"
+    )
+    return query, description
+
+
+def _build_reddit(req_obj: QueryBuilderRequest) -> Tuple[str, str]:
+    """Build a Reddit query (the subreddit name)."""
+    subreddit = (
+        req_obj.filters.subreddit
+        if req_obj.filters and req_obj.filters.subreddit
+        else "MachineLearning"
+    )
+    return subreddit, f"Reddit search in r/{subreddit} for '{req_obj.search_terms}'"
+
+
+_QUERY_BUILDERS: Dict[str, Callable[[QueryBuilderRequest], Tuple[str, str]]] = {
+    "arxiv": _build_arxiv,
+    "reddit": _build_reddit,
+}
+
+
 @router.post("/query/build/{source}", response_model=None)
 async def build_source_query(
-    source: str = Path(..., description="Target data source"), payload: dict = Body(...)
+    req_obj: QueryBuilderRequest,
+    source: str = Path(..., description="Target data source"),
 ):
     """Generate optimized query for a specific data source using AI"""
     try:
-        # Parse incoming payload once
-        req_obj = QueryBuilderRequest.from_dict(payload)
-
-        if source.lower() == "arxiv":
-            # Build arXiv query
-            category = (
-                req_obj.filters.category
-                if req_obj.filters and req_obj.filters.category
-                else "cs.CV"
-            )
-            query = query_service.build_advanced_query(req_obj.search_terms, category)
-            description = f"Advanced arXiv search for '{req_obj.search_terms}' in category {category}"
-        elif source.lower() == "reddit":
-            # Build Reddit query (subreddit name)
-            subreddit = (
-                req_obj.filters.subreddit
-                if req_obj.filters and req_obj.filters.subreddit
-                else "MachineLearning"
-            )
-            query = subreddit
-            description = f"Reddit search in r/{subreddit} for '{req_obj.search_terms}'"
-        else:
+        src_lc = source.lower()
+        builder = _QUERY_BUILDERS.get(src_lc)
+        if builder is None:
             raise HTTPException(status_code=400, detail=f"Unsupported source: {source}")
 
+        query, description = builder(req_obj)
         response_obj = QueryBuilderResponse(
-            query=query, description=description, source=source.lower()
+            query=query, description=description, source=src_lc
         )
         return JSONResponse(content=response_obj.to_dict())
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Failed to build query for source {source}: {str(e)}")
+        logger.error("Failed to build query for source %s: %s", source, e)
         raise HTTPException(status_code=500, detail=f"Failed to build query: {str(e)}")
 
 
@@ -1,18 +1,79 @@
+import asyncio
 import logging
-from fastapi import APIRouter, HTTPException
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException
 from niche_explorer_models.models.classify_request import ClassifyRequest
 from niche_explorer_models.models.classify_response import ClassifyResponse
-from ..services.openweb_client import OpenWebClient
-import re
+from ..services.openweb_client import FALLBACK_CLASSIFICATION, openweb_client
+from ..services.embedding_service import (
+    EmbeddingService,
+    get_optional_embedding_service,
+)
+from ..services.semantic_cache import SemanticCache
+import string
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="", tags=["AI"])
-openweb_client = OpenWebClient()
+
+# Filler words stripped from queries before classification
+_GENERIC_WORDS = frozenset(
+    {
+        "current",
+        "latest",
+        "recent",
+        "research",
+        "study",
+        "studies",
+        "trend",
+        "trends",
+        "paper",
+        "papers",
+        "growing",
+        "growth",
+    }
+)
+# Punctuation stripped from a token's edges before the filler-word lookup
+_EDGE_PUNCT = string.punctuation
+
+# Near-duplicate queries reuse an earlier classification instead of calling the LLM
+classification_cache = SemanticCache(threshold=0.93)
+# Upper bound (seconds) on the query embedding for the semantic cache; past it
+# the request goes straight to the classifier
+_SEMANTIC_LOOKUP_TIMEOUT = 0.5
+
+
+def _is_plain_category(response: ClassifyResponse) -> bool:
+    """True for a bare category/subreddit such as ``cs.CV``.
+
+    Advanced arXiv queries (``all:"..."+AND+cat:cs.CV``) are built from the
+    words of one query, so they must not be served to a merely similar one.
+    """
+    return ":" not in response.suggested_category
+
+
+async def _query_vector(
+    embedding_service: Optional[EmbeddingService], text: str
+) -> List[float]:
+    """Embedding for the semantic cache, or [] when it is unavailable or slow."""
+    if embedding_service is None:
+        return []
+    try:
+        return await asyncio.wait_for(
+            embedding_service.embed_text(text), timeout=_SEMANTIC_LOOKUP_TIMEOUT
+        )
+    except Exception as e:
+        logger.warning("Skipping semantic classification cache: %r", e)
+        return []
 
 
 @router.post("/classify", response_model=ClassifyResponse)
-async def classify_query(request: ClassifyRequest):
+async def classify_query(
+    request: ClassifyRequest,
+    embedding_service: Optional[EmbeddingService] = Depends(
+        get_optional_embedding_service
+    ),
+):
     """Classify query to determine research vs community source"""
     if not request.query or not request.query.strip():
         raise HTTPException(
@@ -20,16 +81,32 @@ async def classify_query(request: ClassifyRequest):
             detail={"code": "INVALID_REQUEST", "message": "Query cannot be empty"},
         )
 
-    generic_words = r"\b(?:current|latest|recent|research|study|studies|trend|trends|paper|papers|growing|growth)\b"
-    cleaned_query = re.sub(generic_words, "", request.query, flags=re.IGNORECASE)
-    cleaned_query = re.sub(r"\s+", " ", cleaned_query).strip()
+    # split()/join() also collapses whitespace
+    cleaned_query = " ".join(
+        token
+        for token in request.query.split()
+        if token.strip(_EDGE_PUNCT).lower() not in _GENERIC_WORDS
+    )
 
     logger.info(
-        f"Received classify request: original='{request.query}', cleaned='{cleaned_query}'"
+        "Received classify request: original='%s', cleaned='%s'",
+        request.query,
+        cleaned_query,
     )
-    response = openweb_client.classify_source(cleaned_query or request.query)
+    query_text = cleaned_query or request.query
+    # Exact repeats are answered without embedding the query at all
+    response = openweb_client.get_cached_classification(query_text)
+    if response is None:
+        query_vector = await _query_vector(embedding_service, query_text)
+        response = classification_cache.get(query_vector)
+        if response is None:
+            response = await openweb_client.aclassify_source(query_text)
+            if response is not FALLBACK_CLASSIFICATION and _is_plain_category(response):
+                classification_cache.put(query_vector, response)
     logger.info(
-        f"Parsed classification data: {response.source=}, {response.suggested_category=}"
+        "Parsed classification data: source=%r, suggested_category=%r",
+        response.source,
+        response.suggested_category,
     )
 
     # Map source to source_type
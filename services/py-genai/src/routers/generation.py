@@ -1,22 +1,22 @@
+import asyncio
 import logging
-import os
 from fastapi import APIRouter, HTTPException
 from niche_explorer_models.models.generate_text_request import GenerateTextRequest
 from niche_explorer_models.models.generate_text_response import GenerateTextResponse
 from ..services.google_client import google_client
-from ..services.openweb_client import OpenWebClient
+from ..services.openweb_client import openweb_client
 from ..settings import settings
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="", tags=["AI"])
 
-# Initialize clients
-openweb_client = OpenWebClient()
+# Upper bound on concurrent upstream LLM calls from this worker. The topics
+# service fans out one request per topic, so these arrive in bursts.
+MAX_CONCURRENT_GENERATIONS = 16
+_generation_semaphore = asyncio.Semaphore(MAX_CONCURRENT_GENERATIONS)
 
-# Determine which client to use based on environment variables
-use_openweb = os.getenv("CHAIR_API_KEY") is not None
-if use_openweb:
+if settings.USE_OPENWEB:
     logger.info("CHAIR_API_KEY found, using OpenWebUI for text generation.")
 else:
     logger.info("CHAIR_API_KEY not found, using Google Gemini for text generation.")
@@ -34,29 +34,34 @@ async def generate_text(request: GenerateTextRequest):
         )
 
     model_to_use = request.model
-    client_name = "OpenWebUI" if use_openweb else "Google Gemini"
 
     logger.info(
-        f"Received generate text request for model '{model_to_use}' via {client_name}"
+        "Received generate text request for model '%s' via %s",
+        model_to_use,
+        settings.GENERATION_CLIENT_NAME,
     )
 
-    if use_openweb:
-        generated_text = openweb_client.generate_text(
-            prompt=request.prompt,
-            model_name=model_to_use,
-            max_tokens=request.max_tokens,
-            temperature=request.temperature,
-        )
-        # OpenWebClient's LLM has a default model if none is provided
-        model_returned = model_to_use or openweb_client.llm.model_name
-    else:
-        generated_text = google_client.generate_text(
-            prompt=request.prompt,
-            model_name=model_to_use or settings.GENERATION_MODEL,
-            max_tokens=request.max_tokens,
-            temperature=request.temperature,
-        )
-        model_returned = model_to_use or settings.GENERATION_MODEL
+    async with _generation_semaphore:
+        if settings.USE_OPENWEB:
+            # The OpenWebUI client is blocking – run it in a worker thread so
+            # concurrent requests overlap instead of stalling the event loop
+            generated_text = await asyncio.to_thread(
+                openweb_client.generate_text,
+                prompt=request.prompt,
+                model_name=model_to_use,
+                max_tokens=request.max_tokens,
+                temperature=request.temperature,
+            )
+            # OpenWebClient's LLM has a default model if none is provided
+            model_returned = model_to_use or openweb_client.llm.model_name
+        else:
+            generated_text = await google_client.generate_text(
+                prompt=request.prompt,
+                model_name=model_to_use or settings.GENERATION_MODEL,
+                max_tokens=request.max_tokens,
+                temperature=request.temperature,
+            )
+            model_returned = model_to_use or settings.GENERATION_MODEL
 
     return GenerateTextResponse(
         text=generated_text,
@@ -0,0 +1,110 @@
+"""
+MicroBatcher – coalesces concurrent single-item awaits into one call of a
+batch function, so per-call overhead (network RTT, model launch) is paid once
+per batch instead of once per caller.
+"""
+
+import asyncio
+import logging
+from typing import (
+    Awaitable,
+    Callable,
+    Generic,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    TypeVar,
+)
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+class MicroBatcher(Generic[T, R]):
+    """Queue items for up to ``max_delay`` seconds (or until ``max_batch_size``
+    items are waiting) and resolve every caller with its slice of the result.
+
+    ``batch_fn`` receives the queued items in submission order and must return
+    one result per item, in the same order.
+    """
+
+    def __init__(
+        self,
+        batch_fn: Callable[[List[T]], Awaitable[List[R]]],
+        max_batch_size: int = 32,
+        max_delay: float = 0.02,
+    ):
+        self._batch_fn = batch_fn
+        self.max_batch_size = max_batch_size
+        self.max_delay = max_delay
+        self._pending: List[Tuple[T, asyncio.Future]] = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        # asyncio only keeps weak references to tasks – hold them until done
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def submit(self, item: T) -> R:
+        """Queue a single item and wait for its result."""
+        loop = asyncio.get_running_loop()
+        future = self._enqueue(loop, item)
+        self._schedule(loop)
+        return await future
+
+    async def submit_many(self, items: Sequence[T]) -> List[R]:
+        """Queue several items at once and wait for all of their results.
+
+        The items may share batches with concurrent callers' items.
+        """
+        loop = asyncio.get_running_loop()
+        futures = [self._enqueue(loop, item) for item in items]
+        self._schedule(loop)
+        return list(await asyncio.gather(*futures))
+
+    # ------------------------------------------------------------------
+    # Internal helpers
+    # ------------------------------------------------------------------
+    def _enqueue(self, loop: asyncio.AbstractEventLoop, item: T) -> asyncio.Future:
+        future = loop.create_future()
+        self._pending.append((item, future))
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        return future
+
+    def _schedule(self, loop: asyncio.AbstractEventLoop) -> None:
+        if self._pending and self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.max_delay, self._flush)
+
+    def _flush(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+        while self._pending:
+            batch = self._pending[: self.max_batch_size]
+            del self._pending[: self.max_batch_size]
+            task = asyncio.ensure_future(self._run(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: List[Tuple[T, asyncio.Future]]) -> None:
+        items = [item for item, _ in batch]
+        try:
+            results = await self._batch_fn(items)
+            if len(results) != len(items):
+                raise RuntimeError(
+                    f"Batch function returned {len(results)} results for {len(items)} items"
+                )
+        except Exception as e:
+            logger.error("Batch of %d items failed: %s", len(items), e)
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future), result in zip(batch, results):
+            # Callers may have been cancelled while the batch was in flight
+            if not future.done():
+                future.set_result(result)
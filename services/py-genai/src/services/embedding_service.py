@@ -1,27 +1,79 @@
+import asyncio
+import hashlib
 import logging
-from typing import List, Dict, Any
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, List, Optional, TypeVar
 
 import psycopg2
+from cachetools import TTLCache
+from prometheus_client import Counter
 from pgvector.psycopg2 import register_vector
-from psycopg2.extras import execute_batch
+from psycopg2.extras import execute_values
 
 from langchain_google_genai import GoogleGenerativeAIEmbeddings
 
 import arxiv
 
+from .batching import MicroBatcher
+from .local_embeddings import LocalSentenceEmbeddings
 from ..settings import settings
 
 import uuid
 
 logger = logging.getLogger(__name__)
-logger.setLevel(logging.DEBUG)  # Temporary for debugging cache behavior
+
+# The explicit text[] cast matches the partial covering index on
+# (external_id, embedding_model) INCLUDE (embedding), so lookups are
+# index-only scans. Vectors from another backend/model count as misses.
+_SELECT_CACHED_SQL = (
+    "SELECT external_id, embedding FROM article "
+    "WHERE external_id = ANY(%s::text[]) AND embedding_model = %s "
+    "AND embedding IS NOT NULL"
+)
+_UPSERT_EMBEDDING_SQL = """
+    INSERT INTO article (id, external_id, embedding, embedding_model)
+    VALUES %s
+    ON CONFLICT (external_id) DO UPDATE
+    SET embedding = EXCLUDED.embedding,
+        embedding_model = EXCLUDED.embedding_model
+"""
+
+T = TypeVar("T")
+
+QUERY_CACHE_HITS = Counter(
+    "embedding_query_cache_hits", "embed_text calls served from the in-process cache"
+)
+QUERY_CACHE_MISSES = Counter(
+    "embedding_query_cache_misses", "embed_text calls sent to the embedding provider"
+)
+
+
+def _vector_to_list(vector: Any) -> List[float]:
+    """Convert a pgvector value to a list of Python floats.
+
+    `vector` columns come back as numpy arrays and `halfvec` columns as
+    `HalfVector`s; both convert in C (`tolist()` / `to_list()`), whereas
+    `list()` yields numpy scalars that must be converted again downstream.
+    """
+    if hasattr(vector, "tolist"):
+        return vector.tolist()
+    if hasattr(vector, "to_list"):
+        return vector.to_list()
+    return list(vector)
 
 
 class EmbeddingService:
     def __init__(self):
-        self.embeddings_client = GoogleGenerativeAIEmbeddings(
-            model=settings.EMBEDDING_MODEL, google_api_key=settings.GOOGLE_API_KEY
-        )
+        if settings.EMBEDDING_BACKEND == "local":
+            self.embeddings_client = LocalSentenceEmbeddings(
+                settings.LOCAL_EMBEDDING_MODEL,
+                quantize_cpu=settings.LOCAL_EMBEDDING_QUANTIZE,
+                cache_folder=settings.LOCAL_EMBEDDING_CACHE_DIR,
+            )
+        else:
+            self.embeddings_client = GoogleGenerativeAIEmbeddings(
+                model=settings.EMBEDDING_MODEL, google_api_key=settings.GOOGLE_API_KEY
+            )
 
         # ------------------------------------------------------------------
         # PostgreSQL connection (pgvector enabled)
@@ -36,17 +88,130 @@ class EmbeddingService:
             )
             self.conn.autocommit = True  # enable autocommit before registering pgvector
             register_vector(self.conn)
+            # Session-wide search breadth for the HNSW index on article.embedding
+            with self.conn.cursor() as cur:
+                cur.execute("SET hnsw.ef_search = %s", (settings.HNSW_EF_SEARCH,))
         except Exception as e:
             logger.error("Failed to connect to Postgres for embeddings storage: %s", e)
             raise
 
+        # Concurrent `embed_text` callers share one provider request
+        self._embed_batcher = MicroBatcher(
+            self._embed_many, max_batch_size=32, max_delay=0.02
+        )
+        # Concurrent `embed_batch_with_cache` requests share one cache lookup,
+        # one encoder call and one upsert per batch
+        self._cache_batcher = MicroBatcher(
+            self._embed_items_with_cache,
+            max_batch_size=settings.EMBED_BATCH_SIZE,
+            max_delay=settings.EMBED_BATCH_MAX_DELAY_MS / 1000,
+        )
+        # L1 for repeated query strings in front of the provider; keyed by the
+        # text's SHA-256 so long queries do not bloat the key set. Only touched
+        # from the event loop, so it needs no lock.
+        self._query_cache: TTLCache = TTLCache(maxsize=10_000, ttl=3600)
+        # Bounds how many worker threads blocking provider/DB calls may occupy
+        self._offload_semaphore = asyncio.Semaphore(settings.EMBED_MAX_THREADS)
+
+    def close(self) -> None:
+        """Close the Postgres connection (called on application shutdown)."""
+        self.conn.close()
+
+    async def _offload(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Run a blocking call in a worker thread so the event loop keeps serving."""
+        async with self._offload_semaphore:
+            return await asyncio.to_thread(fn, *args, **kwargs)
+
+    def _select_cached(self, ids: List[str]) -> Dict[str, List[float]]:
+        """Return the cached embeddings among `ids` as an id -> vector map."""
+        with self.conn.cursor() as cur:
+            cur.execute(_SELECT_CACHED_SQL, (ids, settings.EMBEDDING_MODEL_TAG))
+            return {
+                row[0]: _vector_to_list(row[1])
+                for row in cur.fetchall()
+                if row[1] is not None
+            }
+
+    def _upsert_embeddings(self, pairs: Iterable[tuple[str, List[float]]]) -> None:
+        """Store (external_id, embedding) pairs, updating rows that already exist.
+
+        Rows go out as multi-row INSERTs (one statement per 500 rows). A
+        statement may not update the same row twice, so repeated ids are
+        collapsed first, keeping the last embedding.
+        """
+        latest = dict(pairs)
+        tag = settings.EMBEDDING_MODEL_TAG
+        with self.conn.cursor() as cur:
+            execute_values(
+                cur,
+                _UPSERT_EMBEDDING_SQL,
+                [
+                    (str(uuid.uuid4()), ext_id, emb, tag)
+                    for ext_id, emb in latest.items()
+                ],
+                template="(%s, %s, %s::halfvec, %s)",
+                page_size=500,
+            )
+            self.conn.commit()
+
     async def embed_text(self, text: str) -> List[float]:
-        """Generates a single, non-cached embedding for a given text."""
+        """Generates a single embedding for a given query text.
+
+        Repeated texts are answered from an in-process TTL cache; concurrent
+        misses are coalesced into a single `embed_documents` request.
+        """
+        key = hashlib.sha256(text.encode()).digest()
+        cached = self._query_cache.get(key)
+        if cached is not None:
+            QUERY_CACHE_HITS.inc()
+            return cached
+
+        QUERY_CACHE_MISSES.inc()
         try:
-            return self.embeddings_client.embed_query(text)
+            vector = await self._embed_batcher.submit(text)
         except Exception as e:
             logger.error("Embedding failed for text: %s, error: %s", text[:100], e)
             return []
+        # Failed embeddings (empty vectors) are retried next time
+        if vector:
+            self._query_cache[key] = vector
+        return vector
+
+    async def _embed_many(self, texts: List[str]) -> List[List[float]]:
+        """Batch function behind `embed_text` – one provider call for all queued texts."""
+        # Keep query semantics of `embed_query` for the batched call
+        return await self._offload(
+            self.embeddings_client.embed_documents, texts, task_type="retrieval_query"
+        )
+
+    async def _encode(self, texts: List[str]) -> List[List[float]]:
+        """Document embeddings for the uncached texts of a batch.
+
+        For a remote provider, larger batches are sorted by length and split
+        into mini-batches that are sent concurrently, so similarly sized
+        requests finish together; the vectors are returned in the original
+        order. The local encoder is compute-bound, so it keeps one fused call.
+        """
+        size = settings.EMBED_MINI_BATCH_SIZE
+        if settings.EMBEDDING_BACKEND == "local" or len(texts) <= size:
+            return await self._offload(self.embeddings_client.embed_documents, texts)
+
+        order = sorted(range(len(texts)), key=lambda i: len(texts[i]), reverse=True)
+        chunks = [order[start : start + size] for start in range(0, len(order), size)]
+        chunk_vectors = await asyncio.gather(
+            *(
+                self._offload(
+                    self.embeddings_client.embed_documents, [texts[i] for i in chunk]
+                )
+                for chunk in chunks
+            )
+        )
+
+        vectors: List[Any] = [None] * len(texts)
+        for chunk, embedded in zip(chunks, chunk_vectors):
+            for idx, vector in zip(chunk, embedded):
+                vectors[idx] = vector
+        return vectors
 
     def _embed_batch(self, texts: List[str]) -> List[List[float]]:
         """A private method to generate embeddings for multiple texts."""
@@ -57,37 +222,47 @@ class EmbeddingService:
             return [[] for _ in texts]
 
     async def embed_batch_with_cache(self, texts: List[str], ids: List[str]) -> Dict:
-        """Generate embeddings for multiple texts with ChromaDB caching"""
-        vectors: List[Any] = [None] * len(texts)
+        """Generate embeddings for multiple texts with Postgres caching.
+
+        Items of concurrent requests are coalesced into shared batches.
+        """
+        results = await self._cache_batcher.submit_many(list(zip(texts, ids)))
+        # Distinct ids served from Postgres, not items – a repeated id counts once
+        cached_ids = {ext_id for ext_id, (_, cached) in zip(ids, results) if cached}
+        return {
+            "vectors": [vector for vector, _ in results],
+            "cached_count": len(cached_ids),
+        }
+
+    async def _embed_items_with_cache(
+        self, items: List[tuple[str, str]]
+    ) -> List[tuple[List[float], bool]]:
+        """Batch function behind `embed_batch_with_cache`.
+
+        Takes (text, external_id) pairs and returns one (vector, was_cached)
+        pair per item, in order.
+        """
+        ids = [ext_id for _, ext_id in items]
+        results: List[Any] = [None] * len(items)
 
         # ------------------------------------------------------------------
         # 1. Fetch cached embeddings from Postgres
         # ------------------------------------------------------------------
         try:
-            with self.conn.cursor() as cur:
-                cur.execute(
-                    "SELECT external_id, embedding FROM article WHERE external_id = ANY(%s) AND embedding IS NOT NULL",
-                    (ids,),
-                )
-                rows = cur.fetchall()
-                cached_map = {
-                    row[0]: list(row[1]) for row in rows if row[1] is not None
-                }
+            cached_map = await self._offload(self._select_cached, ids)
         except Exception as e:
             logger.error("Failed to fetch cached embeddings from Postgres: %s", e)
             cached_map = {}
 
-        cached_count = len(cached_map)
-
         # ------------------------------------------------------------------
         # 2. Determine which texts still need embeddings
         # ------------------------------------------------------------------
         new_texts: List[str] = []
         new_ids: List[tuple[int, str]] = []  # (position, external_id)
 
-        for idx, (text, ext_id) in enumerate(zip(texts, ids)):
+        for idx, (text, ext_id) in enumerate(items):
             if ext_id in cached_map:
-                vectors[idx] = cached_map[ext_id]
+                results[idx] = (cached_map[ext_id], True)
             else:
                 new_texts.append(text)
                 new_ids.append((idx, ext_id))
@@ -96,49 +271,36 @@ class EmbeddingService:
         # 3. Generate embeddings for uncached texts
         # ------------------------------------------------------------------
         if new_texts:
-            new_embeddings = self._embed_batch(new_texts)
+            try:
+                new_embeddings = await self._encode(new_texts)
+            except Exception as e:
+                logger.error("Batch embedding failed: %s", e)
+                new_embeddings = [[] for _ in new_texts]
 
             # ------------------------------------------------------------------
             # 3a. Upsert embeddings into Postgres (update existing rows for all analyses)
             # ------------------------------------------------------------------
             try:
-                with self.conn.cursor() as cur:
-                    execute_batch(
-                        cur,
-                        """
-                        INSERT INTO article (id, external_id, embedding)
-                        VALUES (%s, %s, %s)
-                        ON CONFLICT (external_id) DO UPDATE
-                        SET embedding = EXCLUDED.embedding
-                        """,
-                        [
-                            (str(uuid.uuid4()), ext_id, emb)
-                            for (_, ext_id), emb in zip(new_ids, new_embeddings)
-                        ],
-                        page_size=100,
-                    )
-                    self.conn.commit()
+                await self._offload(
+                    self._upsert_embeddings,
+                    [
+                        (ext_id, emb)
+                        for (_, ext_id), emb in zip(new_ids, new_embeddings)
+                    ],
+                )
             except Exception as e:
                 logger.warning("Failed to upsert embeddings into Postgres: %s", e)
 
             # Place new embeddings into the result list
             for (idx, _), embedding in zip(new_ids, new_embeddings):
-                vectors[idx] = embedding
+                results[idx] = (embedding, False)
 
-        return {"vectors": vectors, "cached_count": cached_count}
+        return results
 
     async def get_embeddings_by_ids(self, ids: List[str]) -> Dict:
         """Retrieve cached embeddings by IDs from ChromaDB"""
         try:
-            with self.conn.cursor() as cur:
-                cur.execute(
-                    "SELECT external_id, embedding FROM article WHERE external_id = ANY(%s) AND embedding IS NOT NULL",
-                    (ids,),
-                )
-                rows = cur.fetchall()
-                cached_map = {
-                    row[0]: list(row[1]) for row in rows if row[1] is not None
-                }
+            cached_map = await self._offload(self._select_cached, ids)
 
             embeddings: List[List[float]] = []
             found_count = 0
@@ -157,92 +319,83 @@ class EmbeddingService:
     def get_embeddings(self, articles: List[arxiv.Result]) -> Dict[str, List[float]]:
         """
         Retrieves embeddings for a list of articles. First, it tries to fetch the
-        embeddings from the cache (ChromaDB). For any articles not found in the
+        embeddings from the cache (Postgres). For any articles not found in the
         cache, it generates new embeddings and stores them.
         """
         article_ids = [a.get_short_id() for a in articles]
-        embeddings_map = {}
 
-        # 1. Try to get existing embeddings from the database
+        # 1. Try to get existing embeddings from the database; the id -> vector
+        #    map doubles as the result and as the membership test below
         try:
-            with self.conn.cursor() as cur:
-                cur.execute(
-                    "SELECT external_id, embedding FROM article WHERE external_id = ANY(%s) AND embedding IS NOT NULL",
-                    (article_ids,),
-                )
-                rows = cur.fetchall()
-                cached_ids = {row[0] for row in rows}
-                embeddings_map.update({row[0]: list(row[1]) for row in rows})
-                if cached_ids:
-                    logger.info(
-                        "Read %s embeddings from Postgres cache.", len(cached_ids)
-                    )
+            cache_map = self._select_cached(article_ids)
+            if cache_map:
+                logger.info("Read %s embeddings from Postgres cache.", len(cache_map))
         except Exception as e:
             logger.error("Error fetching embeddings from Postgres: %s", e)
-            cached_ids = set()
+            cache_map = {}
 
-        # 2. Identify articles that need new embeddings
-        new_articles = [
-            article for article in articles if article.get_short_id() not in cached_ids
-        ]
-
-        # Debug log for skipped (cached) articles
-        for article in articles:
-            ext_id = article.get_short_id()
-            if ext_id in cached_ids:
+        # 2. Identify articles that need new embeddings (single pass); the
+        #    (external_id, text) pairs are built once and reused below
+        new_items: List[tuple[str, str]] = []
+        for article, ext_id in zip(articles, article_ids):
+            if ext_id in cache_map:
                 logger.debug(
-                    f"Embedding skipped for article {ext_id} - already cached."
+                    "Embedding skipped for article %s - already cached.", ext_id
                 )
+            else:
+                logger.debug("Generating new embedding for article %s.", ext_id)
+                new_items.append((ext_id, f"{article.title} - {article.summary}"))
 
         # 3. Generate and store embeddings for new articles
-        if new_articles:
+        if new_items:
             logger.info(
-                f"Generating and storing embeddings for {len(new_articles)} new articles."
+                "Generating and storing embeddings for %s new articles.", len(new_items)
             )
 
-            # Debug log for newly generated embeddings
-            for article in new_articles:
-                ext_id = article.get_short_id()
-                logger.debug(f"Generating new embedding for article {ext_id}.")
-
-            texts_to_embed = [
-                f"{article.title} - {article.summary}" for article in new_articles
-            ]
+            new_article_ids = [ext_id for ext_id, _ in new_items]
+            texts_to_embed = [text for _, text in new_items]
             new_embeddings = self._embed_batch(texts_to_embed)
 
-            new_article_ids = [article.get_short_id() for article in new_articles]
-
             # Add new embeddings to Postgres
-            if new_article_ids:
-                try:
-                    with self.conn.cursor() as cur:
-                        execute_batch(
-                            cur,
-                            """
-                            INSERT INTO article (id, external_id, embedding)
-                            VALUES (%s, %s, %s)
-                            ON CONFLICT (external_id) DO UPDATE
-                            SET embedding = EXCLUDED.embedding
-                            """,
-                            [
-                                (str(uuid.uuid4()), ext_id, emb)
-                                for ext_id, emb in zip(new_article_ids, new_embeddings)
-                            ],
-                            page_size=100,
-                        )
-                        self.conn.commit()
-                    logger.info(
-                        "Successfully stored %s new embeddings in Postgres.",
-                        len(new_article_ids),
-                    )
-                    embeddings_map.update(
-                        {id: emb for id, emb in zip(new_article_ids, new_embeddings)}
-                    )
-                except Exception as e:
-                    logger.error("Error storing new embeddings in Postgres: %s", e)
-
-        return embeddings_map
-
-
-# No longer a singleton. Instances will be created where needed.
-# embedding_service = EmbeddingService()
+            try:
+                self._upsert_embeddings(zip(new_article_ids, new_embeddings))
+                logger.info(
+                    "Successfully stored %s new embeddings in Postgres.",
+                    len(new_article_ids),
+                )
+                cache_map.update(zip(new_article_ids, new_embeddings))
+            except Exception as e:
+                logger.error("Error storing new embeddings in Postgres: %s", e)
+
+        return cache_map
+
+
+@lru_cache(maxsize=1)
+def get_embedding_service() -> EmbeddingService:
+    """Return the process-wide EmbeddingService, created on first use.
+
+    Construction opens the Postgres connection and (for the local backend)
+    loads the encoder, so it is deferred until a request actually needs it
+    instead of running at import time in every worker.
+    """
+    return EmbeddingService()
+
+
+def get_optional_embedding_service() -> Optional[EmbeddingService]:
+    """Like `get_embedding_service`, but returns None if it cannot be created.
+
+    For callers that only use embeddings as an optimization (e.g. the
+    classification cache) and must keep working while Postgres is down.
+    """
+    try:
+        return get_embedding_service()
+    except Exception as e:
+        logger.warning("Embedding service unavailable: %s", e)
+        return None
+
+
+def close_embedding_service() -> None:
+    """Close the shared EmbeddingService if one was ever created."""
+    if get_embedding_service.cache_info().currsize:
+        get_embedding_service().close()
+        get_embedding_service.cache_clear()
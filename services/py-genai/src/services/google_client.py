@@ -1,7 +1,9 @@
-import json
+import orjson
 import logging
 import os
+import threading
 import google.generativeai as genai
+from cachetools import LRUCache
 from ..settings import settings
 from fastapi import HTTPException
 
@@ -15,41 +17,63 @@ if not GOOGLE_API_KEY:
 # Configure genai client with newer API
 genai.configure(api_key=GOOGLE_API_KEY)
 
+# Static prompt prefix – built once, and kept byte-identical across calls so
+# the provider can reuse its prefix cache. Only the query is appended.
+_CLASSIFY_PREFIX = (
+    "You are an assistant that classifies research queries and generates ArXiv search parameters.\n"
+    "Return ONLY valid JSON with keys 'source' and 'feed'.\n"
+    "- source: 'research' or 'community'.\n"
+    "- feed: \n"
+    "  * For research: arXiv category (e.g. cs.CV, cs.AI, cs.LG) OR advanced query (e.g. 'all:\"graph neural network\"+AND+cat:cs.CV')\n"
+    "  * For community: subreddit name only (e.g. computervision)\n"
+    "For research queries, prefer advanced ArXiv queries when specific terms are mentioned.\n"
+    "Examples:\n"
+    "- 'computer vision trends' -> cs.CV\n"
+    "- 'graph neural networks in computer vision' -> 'all:\"graph neural network\"+AND+cat:cs.CV'\n"
+    "- 'transformer architectures' -> 'all:\"transformer architecture\"+AND+cat:cs.LG'\n"
+    "User query: "
+)
+
+# Upper bound on cached `generate_text` model handles; the model name comes
+# from the client, so the cache must not grow with every name it is sent
+_MAX_CACHED_MODELS = 8
+
 
 class GoogleGenAIClient:
     def __init__(self):
-        # No need to create client instance with new API
-        pass
+        # Built once and reused by every classification call
+        self.model = genai.GenerativeModel(settings.GENERATION_MODEL)
+        # Handles for `generate_text`, one per recently requested model name
+        self._model_cache: LRUCache = LRUCache(maxsize=_MAX_CACHED_MODELS)
+        self._model_cache[settings.GENERATION_MODEL] = self.model
+        self._model_cache_lock = threading.Lock()
+        self.gen_config = genai.types.GenerationConfig(
+            response_mime_type="application/json"
+        )
 
     def classify_source(self, query: str) -> tuple[str, str]:
         """Classify query to determine research or community source and generate appropriate feed identifier"""
-        prompt = (
-            "You are an assistant that classifies research queries and generates ArXiv search parameters.\n"
-            "Return ONLY valid JSON with keys 'source' and 'feed'.\n"
-            "- source: 'research' or 'community'.\n"
-            "- feed: \n"
-            "  * For research: arXiv category (e.g. cs.CV, cs.AI, cs.LG) OR advanced query (e.g. 'all:\"graph neural network\"+AND+cat:cs.CV')\n"
-            "  * For community: subreddit name only (e.g. computervision)\n"
-            "For research queries, prefer advanced ArXiv queries when specific terms are mentioned.\n"
-            "Examples:\n"
-            "- 'computer vision trends' -> cs.CV\n"
-            "- 'graph neural networks in computer vision' -> 'all:\"graph neural network\"+AND+cat:cs.CV'\n"
-            "- 'transformer architectures' -> 'all:\"transformer architecture\"+AND+cat:cs.LG'\n"
-            f"User query: {query}"
-        )
+        prompt = _CLASSIFY_PREFIX + query
 
         try:
-            model = genai.GenerativeModel(settings.GENERATION_MODEL)
-            response = model.generate_content(
-                prompt, generation_config=genai.types.GenerationConfig()
+            response = self.model.generate_content(
+                prompt, generation_config=self.gen_config
             )
-            data = json.loads(response.text)
+            data = orjson.loads(response.text)
             return data.get("source", "research"), data.get("feed", "cs.CV")
         except Exception as e:
             logger.error("Failed to classify query: %s", e)
             return "research", "cs.CV"
 
-    def generate_text(
+    def _get_model(self, name: str) -> genai.GenerativeModel:
+        """Return the shared model handle for `name`, creating it on first use."""
+        with self._model_cache_lock:
+            model = self._model_cache.get(name)
+            if model is None:
+                model = self._model_cache[name] = genai.GenerativeModel(name)
+            return model
+
+    async def generate_text(
         self, prompt: str, model_name: str, max_tokens: int, temperature: float
     ) -> str:
         """
@@ -66,17 +90,21 @@ class GoogleGenAIClient:
         """
         try:
             logger.info(
-                f"Generating text with model '{model_name}' and prompt: {prompt[:100]}..."
+                "Generating text with model '%s' and prompt: %s...",
+                model_name,
+                prompt[:100],
             )
-            model = genai.GenerativeModel(model_name or settings.GENERATION_MODEL)
+            model = self._get_model(model_name or settings.GENERATION_MODEL)
             config = genai.types.GenerationConfig(
                 max_output_tokens=max_tokens, temperature=temperature
             )
-            response = model.generate_content(prompt, generation_config=config)
+            response = await model.generate_content_async(
+                prompt, generation_config=config
+            )
             logger.info("Successfully generated text.")
             return response.text
         except Exception as e:
-            logger.error(f"Failed to generate text: {e}")
+            logger.error("Failed to generate text: %s", e)
             raise HTTPException(
                 status_code=500,
                 detail={"code": "GENERATION_ERROR", "message": str(e)},
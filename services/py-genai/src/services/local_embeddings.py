@@ -0,0 +1,92 @@
+"""
+LocalSentenceEmbeddings – in-process SentenceTransformer embedder exposing the
+same `embed_query` / `embed_documents` interface as LangChain's
+GoogleGenerativeAIEmbeddings, so EmbeddingService can swap backends freely.
+"""
+
+import logging
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+# Loaded models shared by every LocalSentenceEmbeddings in the process; the lock
+# serialises loading so concurrent initialisers don't each allocate a copy.
+# (huggingface_hub already file-locks downloads across worker processes.)
+_MODEL_CACHE: Dict[Tuple[str, bool, Optional[str]], Any] = {}
+_MODEL_LOCK = threading.Lock()
+
+
+def _load_model(model_name: str, quantize_cpu: bool, cache_folder: Optional[str]):
+    key = (model_name, quantize_cpu, cache_folder)
+    with _MODEL_LOCK:
+        model = _MODEL_CACHE.get(key)
+        if model is None:
+            model = _build_model(model_name, quantize_cpu, cache_folder)
+            # Warm-up pass: allocates buffers and initialises kernels so the
+            # first real request doesn't pay for it
+            model.encode(["warmup"], show_progress_bar=False)
+            _MODEL_CACHE[key] = model
+        return model
+
+
+def _build_model(model_name: str, quantize_cpu: bool, cache_folder: Optional[str]):
+    # Imported lazily – sentence-transformers pulls in torch, which the
+    # default Google backend does not need.
+    import torch
+    from sentence_transformers import SentenceTransformer
+
+    device = "cuda" if torch.cuda.is_available() else "cpu"
+    logger.info("Loading local embedding model %s on %s", model_name, device)
+    # safetensors weights are memory-mapped rather than unpickled, so
+    # workers on one host share the weight pages through the page cache.
+    model = SentenceTransformer(
+        model_name,
+        device=device,
+        cache_folder=cache_folder,
+        model_kwargs={"use_safetensors": True},
+    )
+
+    if device == "cuda":
+        # FP16 halves memory traffic and runs on tensor cores
+        model.half()
+    elif quantize_cpu:
+        # Dynamic INT8 quantization of the Linear layers (weights int8,
+        # activations quantized on the fly) – CPU inference is memory-bound.
+        model = torch.quantization.quantize_dynamic(
+            model, {torch.nn.Linear}, dtype=torch.qint8
+        )
+        logger.info("Applied dynamic INT8 quantization to %s", model_name)
+    return model
+
+
+class LocalSentenceEmbeddings:
+    def __init__(
+        self,
+        model_name: str,
+        batch_size: int = 128,
+        quantize_cpu: bool = False,
+        cache_folder: Optional[str] = None,
+    ):
+        self.model = _load_model(model_name, quantize_cpu, cache_folder)
+        self.batch_size = batch_size
+
+    def embed_query(self, text: str, **kwargs: Any) -> List[float]:
+        return self.embed_documents([text])[0]
+
+    def embed_documents(self, texts: List[str], **kwargs: Any) -> List[List[float]]:
+        """Encode ``texts`` in one forward pass per batch.
+
+        Extra keyword arguments (e.g. Google's ``task_type``) are accepted and ignored.
+        """
+        if not texts:
+            return []
+        vectors = self.model.encode(
+            texts,
+            batch_size=self.batch_size,
+            convert_to_numpy=True,
+            normalize_embeddings=True,
+            show_progress_bar=False,
+        )
+        return vectors.tolist()
@@ -4,14 +4,24 @@
 import os
 import logging
 import requests
-import json
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import asyncio
+import orjson
+import httpx
+import threading
+from cachetools import TTLCache
 from typing import Any, List, Optional
 from langchain.llms.base import LLM
 from langchain_core.prompts import PromptTemplate
-from langchain.callbacks.manager import CallbackManagerForLLMRun
+from langchain.callbacks.manager import (
+    AsyncCallbackManagerForLLMRun,
+    CallbackManagerForLLMRun,
+)
 from niche_explorer_models.models.classify_response import ClassifyResponse
 from fastapi import HTTPException
 import langchain_google_genai
+from .batching import MicroBatcher
 
 logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
@@ -24,6 +34,66 @@ if not CHAIR_API_KEY:
     raise RuntimeError("CHAIR_API_KEY missing in .env")
 
 
+def _build_session() -> requests.Session:
+    """Pooled keep-alive session for OpenWebUI calls.
+
+    Reusing connections skips a TCP+TLS handshake per call. Rate-limit and
+    transient server errors are retried with backoff, honouring Retry-After.
+    """
+    retry = Retry(
+        total=3,
+        # Never retry after a read timeout: the server may still be generating
+        # the completion, and each retry would wait the full timeout again
+        read=0,
+        backoff_factor=0.2,
+        status_forcelist=[429, 500, 502, 503, 504],
+        # Connect errors and the statuses above mean no completion was
+        # produced, so those POSTs can be retried
+        allowed_methods=frozenset({"POST"}),
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=16, pool_maxsize=32, max_retries=retry)
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+# Shared by every OpenWebUILLM instance
+_session = _build_session()
+
+# Async counterpart for `_acall`, created lazily on the running event loop
+_async_client: httpx.AsyncClient | None = None
+
+
+def _get_async_client() -> httpx.AsyncClient:
+    """Return the shared AsyncClient, creating it on first use."""
+    global _async_client
+    if _async_client is None or _async_client.is_closed:
+        _async_client = httpx.AsyncClient(
+            timeout=120,
+            limits=httpx.Limits(max_connections=64, max_keepalive_connections=32),
+        )
+    return _async_client
+
+
+async def aclose_async_client() -> None:
+    """Close the shared async client (called on application shutdown)."""
+    global _async_client
+    if _async_client is not None:
+        await _async_client.aclose()
+        _async_client = None
+
+
+# Returned when the LLM call or its parsing fails; callers can detect it by identity
+FALLBACK_CLASSIFICATION = ClassifyResponse(
+    source="arxiv",
+    source_type="research",
+    suggested_category="cs.CV",
+    confidence=0.5,
+)
+
+
 class OpenWebUILLM(LLM):
     """
     Custom LangChain LLM wrapper for Open WebUI API.
@@ -63,19 +133,57 @@ class OpenWebUILLM(LLM):
             Exception: If API call fails
         """
 
-        headers = {
+        try:
+            response = _session.post(
+                self.api_url,
+                headers=self._headers(),
+                json=self._payload(prompt, kwargs),
+                timeout=120,
+            )
+            response.raise_for_status()
+            return self._content(response.json())
+        except requests.RequestException as e:
+            raise Exception(f"API request failed: {str(e)}")
+        except (KeyError, IndexError, ValueError) as e:
+            raise Exception(f"Failed to parse API response: {str(e)}")
+
+    async def _acall(
+        self,
+        prompt: str,
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> str:
+        """Async variant of `_call`, used by LangChain's `ainvoke`.
+
+        Awaits the API on the shared httpx client, so concurrent requests do
+        not hold the event loop or a worker thread while waiting.
+        """
+        try:
+            response = await _get_async_client().post(
+                self.api_url,
+                headers=self._headers(),
+                json=self._payload(prompt, kwargs),
+            )
+            response.raise_for_status()
+            return self._content(response.json())
+        except httpx.HTTPError as e:
+            raise Exception(f"API request failed: {str(e)}")
+        except (KeyError, IndexError, ValueError) as e:
+            raise Exception(f"Failed to parse API response: {str(e)}")
+
+    def _headers(self) -> dict:
+        return {
             "Authorization": f"Bearer {self.api_key}",
             "Content-Type": "application/json",
         }
 
-        # Build messages for chat completion
-        messages = [{"role": "user", "content": prompt}]
-
+    def _payload(self, prompt: str, kwargs: dict) -> dict:
+        """Chat-completion request body for a single user prompt."""
         payload = {
             "model": self.model_name,
-            "messages": messages,
+            "messages": [{"role": "user", "content": prompt}],
         }
-
         # Add any additional generation parameters from the call
         if "temperature" in kwargs:
             payload["temperature"] = kwargs["temperature"]
@@ -83,28 +191,27 @@ class OpenWebUILLM(LLM):
             payload["max_tokens"] = kwargs["max_tokens"]
         if "model" in kwargs:
             payload["model"] = kwargs["model"]
+        return payload
 
-        try:
-            response = requests.post(
-                self.api_url, headers=headers, json=payload, timeout=120
-            )
+    @staticmethod
+    def _content(result: dict) -> str:
+        """Extract the reply text from a chat-completion response."""
+        if "choices" in result and len(result["choices"]) > 0:
+            return result["choices"][0]["message"]["content"].strip()
+        raise ValueError("Unexpected response format from API")
 
-            response.raise_for_status()
 
-            result = response.json()
-
-            # Extract the response content
-            if "choices" in result and len(result["choices"]) > 0:
-                content = result["choices"][0]["message"]["content"]
-                a = content.strip()
-                return a
-            else:
-                raise ValueError("Unexpected response format from API")
+# Source/feed rules shared by the single-query and batch classification prompts
+_CLASSIFY_RULES = """- source: 'arxiv' or 'reddit'
+- feed  :
+   * arxiv  → either a simple category (cs.CV, cs.AI, cs.LG …) **or** an advanced query string accepted by the arXiv export API (e.g. `all:"graph neural network"+AND+cat:cs.CV`).
+   * reddit → subreddit name (MachineLearning, computervision …).
 
-        except requests.RequestException as e:
-            raise Exception(f"API request failed: {str(e)}")
-        except (KeyError, IndexError, ValueError) as e:
-            raise Exception(f"Failed to parse API response: {str(e)}")
+When you build an advanced arXiv query:
+• Ignore generic stop-words such as: current, latest, recent, research, study, studies, trend, trends, paper, papers, growing, growth.
+• Quote multi-word key phrases inside `all:"…"`.
+• Combine multiple key phrases with `+AND+` and always keep a `cat:<category>` filter.
+"""
 
 
 class OpenWebClient:
@@ -116,16 +223,9 @@ class OpenWebClient:
 
 Return ONLY valid JSON with keys 'source', 'feed', and optional 'confidence'. **No markdown fences**.
 
-- source: 'arxiv' or 'reddit'
-- feed  :
-   * arxiv  → either a simple category (cs.CV, cs.AI, cs.LG …) **or** an advanced query string accepted by the arXiv export API (e.g. `all:"graph neural network"+AND+cat:cs.CV`).
-   * reddit → subreddit name (MachineLearning, computervision …).
-
-When you build an advanced arXiv query:
-• Ignore generic stop-words such as: current, latest, recent, research, study, studies, trend, trends, paper, papers, growing, growth.
-• Quote multi-word key phrases inside `all:"…"`.
-• Combine multiple key phrases with `+AND+` and always keep a `cat:<category>` filter.
-
+"""
+            + _CLASSIFY_RULES
+            + """
 Examples (JSON output):
 "computer vision trends"               → {{"source":"arxiv","feed":"cs.CV"}}
 "graph neural networks in computer vision" → {{"source":"arxiv","feed":"all:graph+neural+network+AND+cat:cs.CV"}}
@@ -134,49 +234,158 @@ Examples (JSON output):
 User query: {query}""",
         )
         self.chain = self.prompt | self.llm
+        # Classifies several queries in one completion; see `_classify_batch`
+        self.batch_prompt = PromptTemplate(
+            input_variables=["queries"],
+            template="""You are an assistant that classifies user queries and selects the best content source.
+
+Classify each numbered query below. Return ONLY a valid JSON array with one object per query, in the same order, each with keys 'source', 'feed', and optional 'confidence'. **No markdown fences**.
+
+"""
+            + _CLASSIFY_RULES
+            + """
+Queries:
+{queries}""",
+        )
+        self.batch_chain = self.batch_prompt | self.llm
+        # Concurrent `aclassify_source` callers share one LLM request
+        self._classify_batcher = MicroBatcher(
+            self._classify_batch, max_batch_size=8, max_delay=0.03
+        )
+        # Exact-match cache of successful classifications, keyed by normalized query
+        self._classify_cache: TTLCache = TTLCache(maxsize=4096, ttl=3600)
+        self._classify_cache_lock = threading.Lock()
 
     def invoke(self, input: str, **kwargs: Any) -> str:
         return self._call(input, **kwargs)
 
     def classify_source(self, query: str) -> ClassifyResponse:
+        cache_key = " ".join(query.lower().split())
+        cached = self._get_cached(cache_key, query)
+        if cached is not None:
+            return cached
+
         try:
             logger.info("Using OpenWebUI for classification")
-
             output = self.chain.invoke({"query": query})
+            return self._store(cache_key, self._parse_classification(output))
+        except Exception as e:
+            logger.error(
+                "Failed to classify query: %s, falling back to default values.", e
+            )
+            return FALLBACK_CLASSIFICATION
 
-            # Strip markdown formatting if present
-            if output.startswith("```"):
-                output = output.strip().strip("```json").strip("```").strip()
+    async def aclassify_source(self, query: str) -> ClassifyResponse:
+        """`classify_source` for async callers; awaits the LLM via `_acall`.
 
-            # Parse the JSON response
-            data = json.loads(output)
+        Concurrent callers are coalesced into one batched LLM request.
+        """
+        cache_key = " ".join(query.lower().split())
+        cached = self._get_cached(cache_key, query)
+        if cached is not None:
+            return cached
 
-            # Accept either new style ('feed') or legacy ('suggested_category')
-            suggested_cat = data.get("feed") or data.get("suggested_category", "cs.CV")
+        try:
+            result = await self._classify_batcher.submit(query)
+            if result is FALLBACK_CLASSIFICATION:
+                return result
+            return self._store(cache_key, result)
+        except Exception as e:
+            logger.error(
+                "Failed to classify query: %s, falling back to default values.", e
+            )
+            return FALLBACK_CLASSIFICATION
 
-            # Normalize shorthand
-            if suggested_cat.strip().lower() in {"cv", "computer vision"}:
-                suggested_cat = "cs.CV"
+    async def _classify_batch(self, queries: List[str]) -> List[ClassifyResponse]:
+        """Batch function behind `aclassify_source`.
 
-            return ClassifyResponse(
-                source=data.get("source", "arxiv"),
-                source_type="research"
-                if data.get("source", "arxiv") == "arxiv"
-                else "community",
-                suggested_category=suggested_cat,
-                confidence=data.get("confidence", 0.8),
-            )
+        A lone query uses the single-query prompt. Several queries go out as
+        one numbered list answered by a JSON array; if that answer cannot be
+        matched up with the queries, each query is classified on its own and
+        those that still fail get FALLBACK_CLASSIFICATION.
+        """
+        logger.info("Using OpenWebUI to classify %d queries", len(queries))
+        if len(queries) == 1:
+            output = await self.chain.ainvoke({"query": queries[0]})
+            return [self._parse_classification(output)]
 
+        numbered = "\n".join(f"{i}: {q}" for i, q in enumerate(queries))
+        try:
+            output = await self.batch_chain.ainvoke({"queries": numbered})
+            items = orjson.loads(self._strip_fences(output))
+            if not isinstance(items, list) or len(items) != len(queries):
+                raise ValueError(
+                    f"Expected a JSON array of {len(queries)} classifications"
+                )
+            return [self._to_classification(item) for item in items]
         except Exception as e:
-            logger.error(
-                f"Failed to classify query: {e}, falling back to default values."
-            )
-            return ClassifyResponse(
-                source="arxiv",
-                source_type="research",
-                suggested_category="cs.CV",
-                confidence=0.5,
-            )
+            logger.warning("Batch classification failed (%s); classifying singly", e)
+
+        outputs = await asyncio.gather(
+            *(self.chain.ainvoke({"query": q}) for q in queries),
+            return_exceptions=True,
+        )
+        results = []
+        for query, output in zip(queries, outputs):
+            try:
+                if isinstance(output, BaseException):
+                    raise output
+                results.append(self._parse_classification(output))
+            except Exception as e:
+                logger.error("Failed to classify query %r: %s", query, e)
+                results.append(FALLBACK_CLASSIFICATION)
+        return results
+
+    def get_cached_classification(self, query: str) -> Optional[ClassifyResponse]:
+        """Exact-match cache lookup that never calls the LLM."""
+        return self._get_cached(" ".join(query.lower().split()), query)
+
+    def _get_cached(self, cache_key: str, query: str) -> Optional[ClassifyResponse]:
+        with self._classify_cache_lock:
+            cached = self._classify_cache.get(cache_key)
+        if cached is not None:
+            logger.debug("Classification cache hit for query: %s", query)
+        return cached
+
+    def _store(self, cache_key: str, result: ClassifyResponse) -> ClassifyResponse:
+        # Only parsed results get here; the fallback is deliberately not cached
+        with self._classify_cache_lock:
+            self._classify_cache[cache_key] = result
+        return result
+
+    @staticmethod
+    def _strip_fences(output: str) -> str:
+        """Strip markdown formatting if present."""
+        if output.startswith("```"):
+            output = output.strip().strip("```json").strip("```").strip()
+        return output
+
+    @classmethod
+    def _parse_classification(cls, output: str) -> ClassifyResponse:
+        """Turn the LLM's JSON answer into a ClassifyResponse."""
+        return cls._to_classification(orjson.loads(cls._strip_fences(output)))
+
+    @staticmethod
+    def _to_classification(data: Any) -> ClassifyResponse:
+        """Build a ClassifyResponse from one parsed JSON object."""
+        if not isinstance(data, dict):
+            raise ValueError(f"Expected a JSON object, got: {data!r}")
+
+        # Accept either new style ('feed') or legacy ('suggested_category')
+        suggested_cat = data.get("feed") or data.get("suggested_category", "cs.CV")
+
+        # Normalize shorthand
+        if suggested_cat.strip().lower() in {"cv", "computer vision"}:
+            suggested_cat = "cs.CV"
+
+        return ClassifyResponse(
+            source=data.get("source", "arxiv"),
+            source_type="research"
+            if data.get("source", "arxiv") == "arxiv"
+            else "community",
+            suggested_category=suggested_cat,
+            confidence=data.get("confidence", 0.8),
+        )
 
     def generate_text(
         self,
@@ -189,7 +398,7 @@ User query: {query}""",
         try:
             effective_model = model_name or self.llm.model_name
             logger.info(
-                f"Using OpenWebUI for text generation with model {effective_model}"
+                "Using OpenWebUI for text generation with model %s", effective_model
             )
 
             params = {}
@@ -203,7 +412,9 @@ User query: {query}""",
             response = self.llm(prompt, **params)
             return response
         except Exception as e:
-            logger.warning(f"OpenWebUI generation failed: {e}. Falling back to Gemini.")
+            logger.warning(
+                "OpenWebUI generation failed: %s. Falling back to Gemini.", e
+            )
             try:
                 from ..settings import settings
 
@@ -213,8 +424,12 @@ User query: {query}""",
                 )
                 return gemini_llm(prompt)
             except Exception as fallback_e:
-                logger.error(f"Gemini fallback also failed: {fallback_e}")
+                logger.error("Gemini fallback also failed: %s", fallback_e)
                 raise HTTPException(
                     status_code=500,
                     detail={"code": "GENERATION_ERROR", "message": str(fallback_e)},
                 ) from fallback_e
+
+
+# Singleton instance – shared by the classification and generation routers
+openweb_client = OpenWebClient()
@@ -5,11 +5,94 @@ fetching itself – that responsibility has moved to the article-fetcher service
 """
 
 import re
+from functools import lru_cache
 from typing import List, Dict
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Patterns used on every query build – compiled once at import time
+_CAT_RE = re.compile(r"\b(cs\.[A-Z]{2}|math\.[A-Z]{2}|physics\.[a-z-]+)\b")
+_SIMPLE_CAT_RE = re.compile(r"^[a-z]+\.[A-Z]{2,}$")
+_WORD_RE = re.compile(r"\b[a-zA-Z]{3,}\b")
+_STOP: frozenset[str] = frozenset(
+    {"the", "and", "or", "in", "on", "at", "to", "for", "of", "with", "by"}
+)
+
+# Keyword -> category, in priority order (earlier entries win)
+_CATEGORY_MAPPINGS: Dict[str, str] = {
+    "computer vision": "cs.CV",
+    "vision": "cs.CV",
+    "image": "cs.CV",
+    "artificial intelligence": "cs.AI",
+    "ai research": "cs.AI",
+    "machine learning": "cs.LG",
+    "deep learning": "cs.LG",
+    "neural network": "cs.LG",
+    "natural language": "cs.CL",
+    "nlp": "cs.CL",
+    "robotics": "cs.RO",
+    "human computer": "cs.HC",
+    "graphics": "cs.GR",
+    "information retrieval": "cs.IR",
+    "cryptography": "cs.CR",
+    "software engineering": "cs.SE",
+    "databases": "cs.DB",
+}
+_CATEGORY_PRIORITY = {term: i for i, term in enumerate(_CATEGORY_MAPPINGS)}
+# One scan over the query finds every keyword occurrence; the zero-width
+# lookahead lets overlapping keywords ("computer vision" / "vision") all match.
+_CATEGORY_TERM_RE = re.compile(
+    "(?=("
+    + "|".join(re.escape(t) for t in sorted(_CATEGORY_MAPPINGS, key=len, reverse=True))
+    + "))"
+)
+
+# Hand-picked popular arXiv categories grouped by discipline
+_CATEGORY_SUGGESTIONS: Dict[str, List[str]] = {
+    "Computer Science": [
+        "cs.AI - Artificial Intelligence",
+        "cs.CV - Computer Vision and Pattern Recognition",
+        "cs.LG - Machine Learning",
+        "cs.CL - Computation and Language",
+        "cs.RO - Robotics",
+        "cs.HC - Human-Computer Interaction",
+        "cs.GR - Graphics",
+        "cs.IR - Information Retrieval",
+        "cs.CR - Cryptography and Security",
+        "cs.SE - Software Engineering",
+        "cs.DB - Databases",
+    ],
+    "Mathematics": [
+        "math.ST - Statistics Theory",
+        "math.OC - Optimization and Control",
+        "math.PR - Probability",
+        "math.NA - Numerical Analysis",
+    ],
+    "Physics": [
+        "physics.data-an - Data Analysis, Statistics and Probability",
+        "physics.comp-ph - Computational Physics",
+    ],
+}
+
+
+def _extract_search_terms(text: str) -> str:
+    meaningful: List[str] = []
+    for word in _WORD_RE.findall(text.lower()):
+        if word not in _STOP:
+            meaningful.append(word)
+            if len(meaningful) == 5:
+                break
+    return " ".join(meaningful)
+
+
+@lru_cache(maxsize=1024)
+def _build_advanced_query(search_terms: str, category: str) -> str:
+    # UI clients rebuild the same (terms, category) pairs repeatedly
+    if not search_terms.strip():
+        return f"cat:{category}"
+    return f'all:"{_extract_search_terms(search_terms)}"+AND+cat:{category}'
+
 
 class QueryGenerationService:
     """Light-weight helper focused on the *generative* part of the GenAI layer.
@@ -22,39 +105,12 @@ class QueryGenerationService:
     # Public helpers ----------------------------------------------------------------
     def build_advanced_query(self, search_terms: str, category: str) -> str:
         """Return an advanced arXiv query like `all:"graph neural network"+AND+cat:cs.CV`."""
-        if not search_terms.strip():
-            return f"cat:{category}"
-
-        cleaned_terms = self._extract_search_terms(search_terms)
-        return f'all:"{cleaned_terms}"+AND+cat:{category}'
+        return _build_advanced_query(search_terms, category)
 
     def get_category_suggestions(self) -> Dict[str, List[str]]:
         """Hand-picked popular arXiv categories grouped by discipline."""
-        return {
-            "Computer Science": [
-                "cs.AI - Artificial Intelligence",
-                "cs.CV - Computer Vision and Pattern Recognition",
-                "cs.LG - Machine Learning",
-                "cs.CL - Computation and Language",
-                "cs.RO - Robotics",
-                "cs.HC - Human-Computer Interaction",
-                "cs.GR - Graphics",
-                "cs.IR - Information Retrieval",
-                "cs.CR - Cryptography and Security",
-                "cs.SE - Software Engineering",
-                "cs.DB - Databases",
-            ],
-            "Mathematics": [
-                "math.ST - Statistics Theory",
-                "math.OC - Optimization and Control",
-                "math.PR - Probability",
-                "math.NA - Numerical Analysis",
-            ],
-            "Physics": [
-                "physics.data-an - Data Analysis, Statistics and Probability",
-                "physics.comp-ph - Computational Physics",
-            ],
-        }
+        # Copy the lists so callers cannot mutate the shared constant
+        return {group: list(cats) for group, cats in _CATEGORY_SUGGESTIONS.items()}
 
     # ------------------------------------------------------------------------------
     # Internal helpers – kept *private* to avoid leaking complexity
@@ -67,14 +123,10 @@ class QueryGenerationService:
             return f"cat:{input_query}"
 
         # Mixed phrase containing category?
-        category_match = re.search(
-            r"\b(cs\.[A-Z]{2}|math\.[A-Z]{2}|physics\.[a-z-]+)\b", input_query
-        )
+        category_match = _CAT_RE.search(input_query)
         if category_match:
             category = category_match.group(1)
-            terms = re.sub(
-                r"\b(cs\.[A-Z]{2}|math\.[A-Z]{2}|physics\.[a-z-]+)\b", "", input_query
-            )
+            terms = _CAT_RE.sub("", input_query)
             terms = self._extract_search_terms(terms.strip())
             return f'all:"{terms}"+AND+cat:{category}' if terms else f"cat:{category}"
 
@@ -87,52 +139,20 @@ class QueryGenerationService:
         return any(op in query for op in advanced_ops)
 
     def _is_simple_category(self, query: str) -> bool:
-        return bool(re.match(r"^[a-z]+\.[A-Z]{2,}$", query.strip()))
+        return bool(_SIMPLE_CAT_RE.match(query.strip()))
 
     def _extract_search_terms(self, text: str) -> str:
-        stop_words = {
-            "the",
-            "and",
-            "or",
-            "in",
-            "on",
-            "at",
-            "to",
-            "for",
-            "of",
-            "with",
-            "by",
-        }
-        words = re.findall(r"\b[a-zA-Z]{3,}\b", text.lower())
-        meaningful = [w for w in words if w not in stop_words]
-        return " ".join(meaningful[:5])
+        return _extract_search_terms(text)
 
     def _convert_natural_language_query(self, query: str) -> str:
         query_lower = query.lower()
-        category_mappings = {
-            "computer vision": "cs.CV",
-            "vision": "cs.CV",
-            "image": "cs.CV",
-            "artificial intelligence": "cs.AI",
-            "ai research": "cs.AI",
-            "machine learning": "cs.LG",
-            "deep learning": "cs.LG",
-            "neural network": "cs.LG",
-            "natural language": "cs.CL",
-            "nlp": "cs.CL",
-            "robotics": "cs.RO",
-            "human computer": "cs.HC",
-            "graphics": "cs.GR",
-            "information retrieval": "cs.IR",
-            "cryptography": "cs.CR",
-            "software engineering": "cs.SE",
-            "databases": "cs.DB",
-        }
         best_category = "cs.AI"
-        for term, category in category_mappings.items():
-            if term in query_lower:
-                best_category = category
-                break
+        # Keep dict-order priority: the earliest mapping found anywhere wins
+        hits = [m.group(1) for m in _CATEGORY_TERM_RE.finditer(query_lower)]
+        if hits:
+            best_category = _CATEGORY_MAPPINGS[
+                min(hits, key=_CATEGORY_PRIORITY.__getitem__)
+            ]
         search_terms = self._extract_search_terms(query)
         return (
             f'all:"{search_terms}"+AND+cat:{best_category}'
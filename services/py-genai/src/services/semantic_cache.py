@@ -0,0 +1,94 @@
+"""
+SemanticCache – nearest-neighbour cache keyed by embedding vectors.
+
+Near-duplicate queries ("computer vision trends" vs "trends in CV") map to
+almost identical embeddings, so a cosine-similarity lookup over previously
+answered queries can stand in for a full LLM call.
+"""
+
+import logging
+import threading
+from typing import Any, Generic, List, Optional, Sequence, TypeVar
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+V = TypeVar("V")
+
+
+class SemanticCache(Generic[V]):
+    """Bounded ring buffer of ``(unit vector, value)`` pairs with cosine-similarity lookup.
+
+    A lookup returns the value of the most similar stored vector if its cosine
+    similarity is at least ``threshold``; otherwise ``None``. Vectors live in a
+    preallocated float32 matrix, so a lookup is a single matrix-vector product.
+    """
+
+    def __init__(self, threshold: float = 0.93, maxsize: int = 2048):
+        self.threshold = threshold
+        self.maxsize = maxsize
+        # Allocated on the first put, once the embedding dimension is known
+        self._matrix: Optional[np.ndarray] = None
+        self._values: List[Optional[V]] = [None] * maxsize
+        self._next = 0
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def get(self, vector: Sequence[float]) -> Optional[V]:
+        """Return the cached value closest to ``vector`` or ``None`` on a miss."""
+        query = self._normalize(vector)
+        if query is None:
+            return None
+
+        with self._lock:
+            if self._matrix is None or self._matrix.shape[1] != query.shape[0]:
+                return None
+            scores = self._matrix[: self._count] @ query
+            best = int(np.argmax(scores))
+            if scores[best] < self.threshold:
+                return None
+            value = self._values[best]
+
+        logger.debug("Semantic cache hit (similarity=%.3f)", scores[best])
+        return value
+
+    def put(self, vector: Sequence[float], value: V) -> None:
+        """Store ``value`` under ``vector``; empty or zero vectors are ignored."""
+        unit = self._normalize(vector)
+        if unit is None:
+            return
+        with self._lock:
+            if self._matrix is None or self._matrix.shape[1] != unit.shape[0]:
+                # First entry, or the embedding model changed – start over
+                self._matrix = np.zeros((self.maxsize, unit.shape[0]), dtype=np.float32)
+                self._values = [None] * self.maxsize
+                self._next = 0
+                self._count = 0
+            self._matrix[self._next] = unit
+            self._values[self._next] = value
+            self._next = (self._next + 1) % self.maxsize
+            self._count = min(self._count + 1, self.maxsize)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._matrix = None
+            self._values = [None] * self.maxsize
+            self._next = 0
+            self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    # ------------------------------------------------------------------
+    # Internal helpers
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _normalize(vector: Any) -> Optional[np.ndarray]:
+        if vector is None or len(vector) == 0:
+            return None
+        arr = np.asarray(vector, dtype=np.float32)
+        norm = float(np.linalg.norm(arr))
+        if norm == 0.0:
+            return None
+        return arr / norm
@@ -3,10 +3,43 @@ import os
 
 class GenAiSettings:
     GOOGLE_API_KEY: str = os.getenv("GOOGLE_API_KEY")
+    CHAIR_API_KEY: str | None = os.getenv("CHAIR_API_KEY")
     APP_TITLE: str = "NicheExplorer GenAI Service"
 
     EMBEDDING_MODEL: str = "models/embedding-001"
+    # "google" (remote Gemini embeddings) or "local" (in-process SentenceTransformer)
+    EMBEDDING_BACKEND: str = os.getenv("EMBEDDING_BACKEND", "google").lower()
+    # Must produce 768-dim vectors to fit the article.embedding column
+    LOCAL_EMBEDDING_MODEL: str = os.getenv(
+        "LOCAL_EMBEDDING_MODEL", "sentence-transformers/all-mpnet-base-v2"
+    )
+    # Vector space of the embeddings this service writes; cached rows tagged
+    # with another backend/model are ignored rather than mixed into results
+    EMBEDDING_MODEL_TAG: str = (
+        f"local:{LOCAL_EMBEDDING_MODEL}"
+        if EMBEDDING_BACKEND == "local"
+        else f"google:{EMBEDDING_MODEL}"
+    )
+    # Dynamic batching of document embeddings: concurrent requests are fused
+    # into one encoder call of up to EMBED_BATCH_SIZE texts. Keep it above
+    # EMBED_MINI_BATCH_SIZE, or remote batches are never split.
+    EMBED_BATCH_SIZE: int = int(os.getenv("EMBED_BATCH_SIZE", "256"))
+    EMBED_BATCH_MAX_DELAY_MS: float = float(os.getenv("EMBED_BATCH_MAX_DELAY_MS", "15"))
+    # Worker threads that blocking embedding-provider and Postgres calls may use
+    EMBED_MAX_THREADS: int = int(os.getenv("EMBED_MAX_THREADS", "8"))
+    # Texts per remote provider request; larger batches are split and sent
+    # concurrently (the local encoder always gets one fused call)
+    EMBED_MINI_BATCH_SIZE: int = int(os.getenv("EMBED_MINI_BATCH_SIZE", "100"))
+    # Download/cache directory for local model weights (None -> HF default)
+    LOCAL_EMBEDDING_CACHE_DIR: str | None = os.getenv("LOCAL_EMBEDDING_CACHE_DIR")
+    # Apply dynamic INT8 quantization when the local model runs on CPU
+    LOCAL_EMBEDDING_QUANTIZE: bool = (
+        os.getenv("LOCAL_EMBEDDING_QUANTIZE", "false").lower() == "true"
+    )
     GENERATION_MODEL: str = "gemini-2.0-flash"
+    # Text generation goes to OpenWebUI when a CHAIR_API_KEY is configured
+    USE_OPENWEB: bool = CHAIR_API_KEY is not None
+    GENERATION_CLIENT_NAME: str = "OpenWebUI" if USE_OPENWEB else "Google Gemini"
 
     DEFAULT_RESEARCH_CATEGORY: str = "cs.CV"
     DEFAULT_COMMUNITY_FEED: str = "https://www.reddit.com/r/computervision/.rss"
@@ -19,6 +52,8 @@ class GenAiSettings:
     POSTGRES_DB: str = os.getenv("POSTGRES_DB", "postgres")
     POSTGRES_USER: str = os.getenv("POSTGRES_USER", "postgres")
     POSTGRES_PASSWORD: str = os.getenv("POSTGRES_PASSWORD", "postgres")
+    # Candidate list size for HNSW similarity queries (recall vs. latency)
+    HNSW_EF_SEARCH: int = int(os.getenv("HNSW_EF_SEARCH", "100"))
 
 
 settings = GenAiSettings()
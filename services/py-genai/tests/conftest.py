@@ -24,7 +24,7 @@ from pgvector.psycopg2 import register_vector  # Real function
 # 1. START THE REAL POSTGRES TEST-CONTAINER  (needed for integration tests)
 # ---------------------------------------------------------------------------
 
-_pg = PostgresContainer("ankane/pgvector:latest")  # image has pgvector pre-installed
+_pg = PostgresContainer("pgvector/pgvector:pg15")  # image has pgvector pre-installed
 _pg.start()
 
 host = _pg.get_container_host_ip()
@@ -54,7 +54,8 @@ cur.execute(
     CREATE TABLE IF NOT EXISTS article (
         id UUID PRIMARY KEY,
         external_id TEXT UNIQUE NOT NULL,
-        embedding   vector(768)
+        embedding   halfvec(768),
+        embedding_model TEXT
     );
     """
 )
@@ -66,7 +66,7 @@ class TestPyGenAiProvider:
                 source="arxiv", source_type="research", suggested_category="cs.AI"
             )
             mocker.patch(
-                "src.services.openweb_client.OpenWebClient.classify_source",
+                "src.services.openweb_client.OpenWebClient.aclassify_source",
                 return_value=mock_response,
             )
             return True
@@ -75,7 +75,7 @@ class TestPyGenAiProvider:
             """Setup for POST /embeddings"""
             mock_response = {"vectors": [[0.1, 0.2, 0.3]], "cached_count": 0}
             mocker.patch(
-                "src.services.embedding_service.embedding_service.embed_batch_with_cache",
+                "src.services.embedding_service.EmbeddingService.embed_batch_with_cache",
                 return_value=mock_response,
             )
             return True
@@ -84,7 +84,7 @@ class TestPyGenAiProvider:
             """Setup for GET /embeddings"""
             mock_response = {"embeddings": [[0.1, 0.2, 0.3]], "found_count": 1}
             mocker.patch(
-                "src.services.embedding_service.embedding_service.get_embeddings_by_ids",
+                "src.services.embedding_service.EmbeddingService.get_embeddings_by_ids",
                 return_value=mock_response,
             )
             return True
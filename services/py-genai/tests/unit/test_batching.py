@@ -0,0 +1,97 @@
+import asyncio
+
+import pytest
+from src.services.batching import MicroBatcher
+
+
+@pytest.mark.asyncio
+async def test_concurrent_submits_share_one_batch():
+    """
+    Tests that items submitted concurrently are passed to the batch function
+    in a single call and each caller receives its own result.
+    """
+    # Arrange
+    calls = []
+
+    async def batch_fn(items):
+        calls.append(list(items))
+        return [item.upper() for item in items]
+
+    batcher = MicroBatcher(batch_fn, max_batch_size=8, max_delay=0.01)
+
+    # Act
+    results = await asyncio.gather(*(batcher.submit(t) for t in ["a", "b", "c"]))
+
+    # Assert
+    assert results == ["A", "B", "C"]
+    assert calls == [["a", "b", "c"]]
+
+
+@pytest.mark.asyncio
+async def test_batches_are_capped_at_max_batch_size():
+    """
+    Tests that a full batch is flushed immediately and the rest is split.
+    """
+    # Arrange
+    calls = []
+
+    async def batch_fn(items):
+        calls.append(list(items))
+        return items
+
+    batcher = MicroBatcher(batch_fn, max_batch_size=2, max_delay=0.01)
+
+    # Act
+    results = await asyncio.gather(*(batcher.submit(i) for i in range(5)))
+
+    # Assert
+    assert results == [0, 1, 2, 3, 4]
+    assert [len(c) for c in calls] == [2, 2, 1]
+
+
+@pytest.mark.asyncio
+async def test_batch_failure_is_raised_to_every_caller():
+    """
+    Tests that an exception in the batch function propagates to all callers.
+    """
+
+    # Arrange
+    async def batch_fn(items):
+        raise ValueError("provider down")
+
+    batcher = MicroBatcher(batch_fn, max_batch_size=4, max_delay=0.01)
+
+    # Act
+    results = await asyncio.gather(
+        batcher.submit("x"), batcher.submit("y"), return_exceptions=True
+    )
+
+    # Assert
+    assert all(isinstance(r, ValueError) for r in results)
+
+
+@pytest.mark.asyncio
+async def test_submit_many_shares_batches_with_concurrent_callers():
+    """
+    Tests that multi-item submissions are fused with concurrent single items
+    and every caller gets its results back in order.
+    """
+    # Arrange
+    calls = []
+
+    async def batch_fn(items):
+        calls.append(list(items))
+        return [item * 10 for item in items]
+
+    batcher = MicroBatcher(batch_fn, max_batch_size=8, max_delay=0.01)
+
+    # Act
+    many, single, empty = await asyncio.gather(
+        batcher.submit_many([1, 2, 3]), batcher.submit(4), batcher.submit_many([])
+    )
+
+    # Assert
+    assert many == [10, 20, 30]
+    assert single == 40
+    assert empty == []
+    assert calls == [[1, 2, 3, 4]]
@@ -1,25 +1,43 @@
 import pytest
 from fastapi.testclient import TestClient
-from unittest.mock import MagicMock
+from unittest.mock import AsyncMock, MagicMock
 from src.main import app  # Import the FastAPI app instance
-from src.routers.classification import openweb_client
+from src.routers.classification import classification_cache, openweb_client
+from src.services.embedding_service import get_optional_embedding_service
 
 client = TestClient(app)
 
 
 # Mock the attrs response object that openweb_client returns
 @pytest.fixture
-def mock_openweb_client(mocker):
-    # This is the object that openweb_client.classify_source returns
+def mock_openweb_client(mocker, mock_embedding_service):
+    # This is the object that openweb_client.aclassify_source returns
     mock_response = MagicMock()
     mock_response.source = "arxiv"
     mock_response.suggested_category = "Artificial Intelligence"
 
     # Patch the method on the imported instance
-    mocker.patch.object(openweb_client, "classify_source", return_value=mock_response)
+    mocker.patch.object(
+        openweb_client, "aclassify_source", AsyncMock(return_value=mock_response)
+    )
+    mocker.patch.object(openweb_client, "get_cached_classification", return_value=None)
+    # No embedding -> the semantic cache is bypassed
+    mock_embedding_service.embed_text.return_value = []
     return openweb_client
 
 
+@pytest.fixture(autouse=True)
+def mock_embedding_service():
+    """Overrides the lazily created EmbeddingService dependency."""
+    service_instance_mock = MagicMock()
+    service_instance_mock.embed_text = AsyncMock(return_value=[])
+    app.dependency_overrides[get_optional_embedding_service] = (
+        lambda: service_instance_mock
+    )
+    yield service_instance_mock
+    app.dependency_overrides.pop(get_optional_embedding_service, None)
+
+
 def test_classify_query_success(mock_openweb_client):
     """
     Tests the happy path for the /classify endpoint.
@@ -40,7 +58,7 @@ def test_classify_query_success(mock_openweb_client):
     # The classification endpoint cleans generic filler words before
     # forwarding the text to the LLM. Ensure we called the client exactly once
     # regardless of the cleaned content.
-    mock_openweb_client.classify_source.assert_called_once()
+    mock_openweb_client.aclassify_source.assert_awaited_once()
 
 
 def test_classify_query_empty_query():
@@ -74,3 +92,69 @@ def test_classify_query_no_query():
 
     # Assert
     assert response.status_code == 422
+
+
+def test_classify_query_semantic_cache_hit(mock_openweb_client, mock_embedding_service):
+    """
+    Tests that a near-duplicate query is answered from the semantic cache
+    without calling the LLM a second time.
+    """
+    # Arrange
+    classification_cache.clear()
+    mock_embedding_service.embed_text.side_effect = [
+        [1.0, 0.0, 0.1],
+        [1.0, 0.0, 0.12],
+    ]
+
+    # Act
+    first = client.post("/api/v1/classify", json={"query": "computer vision trends"})
+    second = client.post("/api/v1/classify", json={"query": "trends in CV"})
+
+    # Assert
+    assert first.status_code == second.status_code == 200
+    assert second.json()["suggested_category"] == "Artificial Intelligence"
+    mock_openweb_client.aclassify_source.assert_awaited_once()
+    classification_cache.clear()
+
+
+def test_classify_query_skips_semantic_cache_for_advanced_queries(
+    mock_openweb_client, mock_embedding_service
+):
+    """
+    Tests that a query-specific advanced arXiv query is never served to a
+    merely similar query.
+    """
+    # Arrange
+    classification_cache.clear()
+    mock_openweb_client.aclassify_source.return_value.suggested_category = (
+        'all:"graph neural network"+AND+cat:cs.CV'
+    )
+    mock_embedding_service.embed_text.side_effect = [
+        [1.0, 0.0, 0.1],
+        [1.0, 0.0, 0.12],
+    ]
+
+    # Act
+    client.post("/api/v1/classify", json={"query": "graph neural networks"})
+    client.post("/api/v1/classify", json={"query": "graph neural nets"})
+
+    # Assert
+    assert mock_openweb_client.aclassify_source.await_count == 2
+    assert len(classification_cache) == 0
+
+
+def test_classify_query_without_embedding_service(mock_openweb_client):
+    """
+    Tests that classification still works when the embedding service (and
+    with it Postgres) is unavailable.
+    """
+    # Arrange
+    app.dependency_overrides[get_optional_embedding_service] = lambda: None
+
+    # Act
+    response = client.post("/api/v1/classify", json={"query": "computer vision"})
+
+    # Assert
+    assert response.status_code == 200
+    assert response.json()["suggested_category"] == "Artificial Intelligence"
+    mock_openweb_client.aclassify_source.assert_awaited_once()
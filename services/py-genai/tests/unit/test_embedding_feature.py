@@ -1,7 +1,8 @@
 import pytest
-from unittest.mock import MagicMock, AsyncMock, patch
+from unittest.mock import MagicMock, AsyncMock
 
 from src.main import app
+from src.services.embedding_service import get_embedding_service
 from fastapi.testclient import TestClient
 
 client = TestClient(app)
@@ -10,18 +11,17 @@ client = TestClient(app)
 @pytest.fixture
 def mock_embedding_service():
     """
-    Mocks the embedding_service instance within the router module.
-    This is the most reliable way to mock for this application's structure.
+    Overrides the EmbeddingService dependency of the router, so no database
+    connection or embedding model is created.
     It uses AsyncMock for the service's async methods.
     """
     service_instance_mock = MagicMock()
     service_instance_mock.embed_batch_with_cache = AsyncMock()
     service_instance_mock.get_embeddings_by_ids = AsyncMock()
 
-    with patch(
-        "src.routers.embedding.embedding_service", service_instance_mock
-    ) as mock:
-        yield mock
+    app.dependency_overrides[get_embedding_service] = lambda: service_instance_mock
+    yield service_instance_mock
+    app.dependency_overrides.pop(get_embedding_service, None)
 
 
 # --- POST /embeddings Tests ---
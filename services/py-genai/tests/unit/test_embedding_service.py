@@ -1,3 +1,6 @@
+import asyncio
+import numpy as np
+import threading
 import pytest
 from unittest.mock import MagicMock, patch
 from src.services.embedding_service import EmbeddingService
@@ -34,8 +37,8 @@ def mock_embedding_service():
         # duration of the test.
         "src.services.embedding_service.register_vector"
     ) as _mock_register_vector, patch(
-        "src.services.embedding_service.execute_batch"
-    ) as mock_execute_batch:
+        "src.services.embedding_service.execute_values"
+    ) as mock_execute_values:
         # --- Mock the Google Embeddings Client ---
         # `GoogleGenerativeAIEmbeddings` is a class. We mock its constructor
         # to return a controllable instance.
@@ -56,9 +59,11 @@ def mock_embedding_service():
 
         # Now, when we instantiate the service, its `__init__` will use our mocks
         service = EmbeddingService()
+        # Forget the session setup statements issued by `__init__`
+        fake_cur.reset_mock()
 
         # Yield the service and mocks so tests can use them and make assertions
-        yield service, fake_cur, mock_google_embed_instance, mock_execute_batch
+        yield service, fake_cur, mock_google_embed_instance, mock_execute_values
 
 
 def test_embedding_service_initialization(mock_embedding_service):
@@ -87,7 +92,7 @@ async def test_embed_batch_with_cache_all_new(mock_embedding_service):
     THEN:  It should return a cached_count of 0, generate two new vectors,
            and have called the database and the Google client.
     """
-    service, fake_cur, mock_google_embed, mock_execute_batch = mock_embedding_service
+    service, fake_cur, mock_google_embed, mock_execute_values = mock_embedding_service
     texts = ["new text 1", "new text 2"]
     ids = ["new1", "new2"]
     # Simulate the DB finding no existing embeddings for these IDs
@@ -104,7 +109,7 @@ async def test_embed_batch_with_cache_all_new(mock_embedding_service):
     # Check that it called Google's API to generate new embeddings
     mock_google_embed.embed_documents.assert_called_once_with(texts)
     # Check that it tried to write the new embeddings back to the DB
-    mock_execute_batch.assert_called_once()
+    mock_execute_values.assert_called_once()
 
 
 @pytest.mark.asyncio
@@ -115,7 +120,7 @@ async def test_embed_batch_with_cache_some_cached(mock_embedding_service):
     THEN:  It should return a cached_count of 1, generate one new vector,
            and only call the Google client for the uncached document.
     """
-    service, fake_cur, mock_google_embed, mock_execute_batch = mock_embedding_service
+    service, fake_cur, mock_google_embed, mock_execute_values = mock_embedding_service
     texts = ["cached text", "new text"]
     ids = ["cached1", "new1"]
     # Simulate the DB finding one cached embedding
@@ -134,4 +139,214 @@ async def test_embed_batch_with_cache_some_cached(mock_embedding_service):
     # Check that it called Google's API with only the single new text
     mock_google_embed.embed_documents.assert_called_once_with(["new text"])
     # Check that it tried to write the new embedding back to the DB
-    mock_execute_batch.assert_called_once()
+    mock_execute_values.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_embed_batch_with_cache_coalesces_concurrent_requests(
+    mock_embedding_service,
+):
+    """
+    GIVEN: Two concurrent requests, one of which hits the cache.
+    WHEN:  `embed_batch_with_cache` is awaited for both at once.
+    THEN:  They should share one cache lookup and one embedding call, and each
+           request should get back only its own vectors and cached_count.
+    """
+    service, fake_cur, mock_google_embed, mock_execute_values = mock_embedding_service
+    fake_cur.fetchall.return_value = [("cached1", [0.5, 0.6])]
+    mock_google_embed.embed_documents.return_value = [[1.0, 1.1], [2.0, 2.1]]
+
+    # Act
+    first, second = await asyncio.gather(
+        service.embed_batch_with_cache(
+            ["cached text", "new text 1"], ["cached1", "new1"]
+        ),
+        service.embed_batch_with_cache(["new text 2"], ["new2"]),
+    )
+
+    # Assert
+    assert first == {"vectors": [[0.5, 0.6], [1.0, 1.1]], "cached_count": 1}
+    assert second == {"vectors": [[2.0, 2.1]], "cached_count": 0}
+    fake_cur.execute.assert_called_once()
+    mock_google_embed.embed_documents.assert_called_once_with(
+        ["new text 1", "new text 2"]
+    )
+    mock_execute_values.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_get_embeddings_by_ids_converts_pgvector_arrays(mock_embedding_service):
+    """
+    GIVEN: pgvector returning a cached embedding as a numpy array.
+    WHEN:  `get_embeddings_by_ids` is called.
+    THEN:  The vector should come back as a list of plain Python floats.
+    """
+    service, fake_cur, _, _ = mock_embedding_service
+    fake_cur.fetchall.return_value = [
+        ("cached1", np.array([0.5, 0.25], dtype=np.float32))
+    ]
+
+    # Act
+    result = await service.get_embeddings_by_ids(["cached1", "missing"])
+
+    # Assert
+    assert result == {"embeddings": [[0.5, 0.25], []], "found_count": 1}
+    assert type(result["embeddings"][0][0]) is float
+
+
+@pytest.mark.asyncio
+async def test_embed_batch_with_cache_runs_blocking_calls_off_the_loop(
+    mock_embedding_service,
+):
+    """
+    GIVEN: A request whose documents are not cached.
+    WHEN:  `embed_batch_with_cache` is called.
+    THEN:  The blocking embedding call should run in a worker thread, not on
+           the event loop's thread.
+    """
+    service, fake_cur, mock_google_embed, _ = mock_embedding_service
+    fake_cur.fetchall.return_value = []
+    calling_threads = []
+
+    def embed_documents(texts):
+        calling_threads.append(threading.get_ident())
+        return [[1.0, 1.1] for _ in texts]
+
+    mock_google_embed.embed_documents.side_effect = embed_documents
+
+    # Act
+    await service.embed_batch_with_cache(["new text"], ["new1"])
+
+    # Assert
+    assert calling_threads
+    assert threading.get_ident() not in calling_threads
+
+
+@pytest.mark.asyncio
+async def test_encode_splits_large_batches_by_length(mock_embedding_service, mocker):
+    """
+    GIVEN: More uncached texts than fit into one mini-batch.
+    WHEN:  `_encode` is called.
+    THEN:  The longest texts should be sent together, one provider call per
+           mini-batch, and the vectors should come back in input order.
+    """
+    service, _, mock_google_embed, _ = mock_embedding_service
+    mocker.patch("src.services.embedding_service.settings.EMBED_MINI_BATCH_SIZE", 2)
+    mock_google_embed.embed_documents.side_effect = lambda texts: [
+        [float(len(text))] for text in texts
+    ]
+    texts = ["a", "ccc", "bb"]
+
+    # Act
+    vectors = await service._encode(texts)
+
+    # Assert
+    assert vectors == [[1.0], [3.0], [2.0]]
+    sent = [c.args[0] for c in mock_google_embed.embed_documents.call_args_list]
+    assert sorted(sent) == [["a"], ["ccc", "bb"]]
+
+
+@pytest.mark.asyncio
+async def test_default_batches_are_split_into_mini_batches(mock_embedding_service):
+    """
+    GIVEN: Default settings and one request with more uncached texts than a
+           mini-batch holds.
+    WHEN:  `embed_batch_with_cache` is awaited.
+    THEN:  The fused batch should reach `_encode` whole and go to the provider
+           as several concurrent mini-batches.
+    """
+    service, fake_cur, mock_google_embed, _ = mock_embedding_service
+    fake_cur.fetchall.return_value = []
+    mock_google_embed.embed_documents.side_effect = lambda texts: [
+        [float(len(text))] for text in texts
+    ]
+    texts = ["x" * (i + 1) for i in range(150)]
+
+    # Act
+    result = await service.embed_batch_with_cache(texts, [str(i) for i in range(150)])
+
+    # Assert
+    assert result["vectors"] == [[float(len(text))] for text in texts]
+    sizes = [len(c.args[0]) for c in mock_google_embed.embed_documents.call_args_list]
+    assert sorted(sizes) == [50, 100]
+
+
+@pytest.mark.asyncio
+async def test_cached_count_counts_distinct_ids(mock_embedding_service):
+    """
+    GIVEN: A request that repeats an id whose embedding is already cached.
+    WHEN:  `embed_batch_with_cache` is awaited.
+    THEN:  `cached_count` should count the distinct cached ids, not the items.
+    """
+    service, fake_cur, mock_google_embed, _ = mock_embedding_service
+    fake_cur.fetchall.return_value = [("a1", [0.5, 0.5])]
+    mock_google_embed.embed_documents.return_value = [[1.0, 1.1]]
+
+    # Act
+    result = await service.embed_batch_with_cache(
+        ["text a", "text a", "text b"], ["a1", "a1", "b2"]
+    )
+
+    # Assert
+    assert result["cached_count"] == 1
+    assert result["vectors"] == [[0.5, 0.5], [0.5, 0.5], [1.0, 1.1]]
+
+
+@pytest.mark.asyncio
+async def test_encode_keeps_one_call_for_local_backend(mock_embedding_service, mocker):
+    """
+    GIVEN: The local encoder backend and more texts than one mini-batch.
+    WHEN:  `_encode` is called.
+    THEN:  The texts should go to the encoder in a single fused call.
+    """
+    service, _, mock_google_embed, _ = mock_embedding_service
+    mocker.patch("src.services.embedding_service.settings.EMBED_MINI_BATCH_SIZE", 2)
+    mocker.patch("src.services.embedding_service.settings.EMBEDDING_BACKEND", "local")
+    mock_google_embed.embed_documents.side_effect = lambda texts: [
+        [float(len(text))] for text in texts
+    ]
+
+    # Act
+    vectors = await service._encode(["a", "ccc", "bb"])
+
+    # Assert
+    assert vectors == [[1.0], [3.0], [2.0]]
+    mock_google_embed.embed_documents.assert_called_once_with(["a", "ccc", "bb"])
+
+
+@pytest.mark.asyncio
+async def test_embed_text_serves_repeated_queries_from_cache(mock_embedding_service):
+    """
+    GIVEN: The same query text embedded twice.
+    WHEN:  `embed_text` is awaited for both.
+    THEN:  Only the first call should reach the embedding provider.
+    """
+    service, _, mock_google_embed, _ = mock_embedding_service
+    mock_google_embed.embed_documents.return_value = [[0.1, 0.2]]
+
+    # Act
+    first = await service.embed_text("vision transformers")
+    second = await service.embed_text("vision transformers")
+
+    # Assert
+    assert first == second == [0.1, 0.2]
+    mock_google_embed.embed_documents.assert_called_once()
+
+
+def test_upsert_embeddings_collapses_repeated_ids(mock_embedding_service):
+    """
+    GIVEN: Two embeddings for the same external id in one upsert.
+    WHEN:  `_upsert_embeddings` is called.
+    THEN:  A single row carrying the last embedding should be written.
+    """
+    service, _, _, mock_execute_values = mock_embedding_service
+
+    # Act
+    service._upsert_embeddings([("dup", [1.0]), ("other", [3.0]), ("dup", [2.0])])
+
+    # Assert
+    rows = mock_execute_values.call_args.args[2]
+    assert [(ext_id, emb) for _, ext_id, emb, _ in rows] == [
+        ("dup", [2.0]),
+        ("other", [3.0]),
+    ]
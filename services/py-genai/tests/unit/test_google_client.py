@@ -1,16 +1,22 @@
 import pytest
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, MagicMock, AsyncMock
 import json
 from src.services.google_client import GoogleGenAIClient
 
 
 @pytest.fixture
-def google_client():
+def MockGenerativeModel():
+    """Patches the Gemini model class; the client builds its model in __init__."""
+    with patch("src.services.google_client.genai.GenerativeModel") as mock_cls:
+        yield mock_cls
+
+
+@pytest.fixture
+def google_client(MockGenerativeModel):
     """Provides a GoogleGenAIClient instance for testing."""
     return GoogleGenAIClient()
 
 
-@patch("src.services.google_client.genai.GenerativeModel")
 def test_classify_source_success(MockGenerativeModel, google_client):
     """
     Tests successful classification when the Google GenAI API returns valid JSON.
@@ -31,7 +37,6 @@ def test_classify_source_success(MockGenerativeModel, google_client):
     mock_model_instance.generate_content.assert_called_once()
 
 
-@patch("src.services.google_client.genai.GenerativeModel")
 def test_classify_source_api_failure(MockGenerativeModel, google_client):
     """
     Tests the fallback mechanism when the Google GenAI API call fails.
@@ -48,7 +53,6 @@ def test_classify_source_api_failure(MockGenerativeModel, google_client):
     assert feed == "cs.CV"
 
 
-@patch("src.services.google_client.genai.GenerativeModel")
 def test_classify_source_invalid_json(MockGenerativeModel, google_client):
     """
     Tests the fallback mechanism when the API returns invalid JSON.
@@ -65,3 +69,71 @@ def test_classify_source_invalid_json(MockGenerativeModel, google_client):
     # Assert
     assert source == "research"
     assert feed == "cs.CV"
+
+
+@pytest.mark.asyncio
+async def test_generate_text_awaits_async_api(MockGenerativeModel, google_client):
+    """
+    Tests that text generation uses the non-blocking Gemini API.
+    """
+    # Arrange
+    mock_model_instance = MockGenerativeModel.return_value
+    mock_response = MagicMock()
+    mock_response.text = "generated"
+    mock_model_instance.generate_content_async = AsyncMock(return_value=mock_response)
+
+    # Act
+    text = await google_client.generate_text(
+        "a prompt", model_name="gemini-2.0-flash", max_tokens=64, temperature=0.2
+    )
+
+    # Assert
+    assert text == "generated"
+    mock_model_instance.generate_content_async.assert_awaited_once()
+    mock_model_instance.generate_content.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_generate_text_reuses_model_handles(MockGenerativeModel, google_client):
+    """
+    Tests that a model handle is built once per model name and then reused.
+    """
+    # Arrange
+    mock_model_instance = MockGenerativeModel.return_value
+    mock_response = MagicMock()
+    mock_response.text = "generated"
+    mock_model_instance.generate_content_async = AsyncMock(return_value=mock_response)
+    MockGenerativeModel.reset_mock()
+
+    # Act
+    for _ in range(3):
+        await google_client.generate_text(
+            "a prompt", model_name="gemini-1.5-pro", max_tokens=64, temperature=0.2
+        )
+
+    # Assert
+    MockGenerativeModel.assert_called_once_with("gemini-1.5-pro")
+
+
+@pytest.mark.asyncio
+async def test_generate_text_bounds_model_handle_cache(
+    MockGenerativeModel, google_client
+):
+    """
+    Tests that client-supplied model names cannot grow the handle cache without bound.
+    """
+    # Arrange
+    mock_model_instance = MockGenerativeModel.return_value
+    mock_response = MagicMock()
+    mock_response.text = "generated"
+    mock_model_instance.generate_content_async = AsyncMock(return_value=mock_response)
+
+    # Act
+    for i in range(50):
+        await google_client.generate_text(
+            "a prompt", model_name=f"model-{i}", max_tokens=64, temperature=0.2
+        )
+
+    # Assert
+    assert len(google_client._model_cache) == google_client._model_cache.maxsize
+    assert "model-49" in google_client._model_cache
@@ -1,7 +1,13 @@
+import asyncio
 import pytest
 import json
-from unittest.mock import MagicMock, patch
-from src.services.openweb_client import OpenWebClient
+from unittest.mock import AsyncMock, MagicMock, patch
+from src.services.openweb_client import (
+    API_URL,
+    FALLBACK_CLASSIFICATION,
+    OpenWebClient,
+    _session,
+)
 from niche_explorer_models.models.classify_response import ClassifyResponse
 
 
@@ -94,3 +100,153 @@ def test_classify_source_llm_exception_fallback(web_client):
     assert result.source_type == "research"
     assert result.suggested_category == "cs.CV"
     assert result.confidence == 0.5
+
+
+def test_classify_source_caches_repeated_queries(web_client):
+    """
+    Tests that an identical (case/whitespace-normalized) query is served from cache.
+    """
+    # Arrange
+    web_client.chain.invoke.return_value = json.dumps(
+        {"source": "arxiv", "feed": "cs.LG"}
+    )
+
+    # Act
+    first = web_client.classify_source("Graph Neural Networks")
+    second = web_client.classify_source("  graph   neural networks ")
+
+    # Assert
+    assert first.suggested_category == second.suggested_category == "cs.LG"
+    web_client.chain.invoke.assert_called_once()
+
+
+def test_classify_source_does_not_cache_fallback(web_client):
+    """
+    Tests that fallback values from a failed call are not cached.
+    """
+    # Arrange
+    web_client.chain.invoke.side_effect = [
+        Exception("LLM is down"),
+        json.dumps({"source": "reddit", "feed": "computervision"}),
+    ]
+
+    # Act
+    first = web_client.classify_source("a flaky query")
+    second = web_client.classify_source("a flaky query")
+
+    # Assert
+    assert first.suggested_category == "cs.CV"
+    assert second.suggested_category == "computervision"
+    assert web_client.chain.invoke.call_count == 2
+
+
+def test_get_cached_classification_does_not_call_llm(web_client):
+    """
+    Tests that the exact-match lookup only reads the cache.
+    """
+    # Arrange
+    web_client.chain.invoke.return_value = json.dumps(
+        {"source": "arxiv", "feed": "cs.LG"}
+    )
+
+    # Act
+    missing = web_client.get_cached_classification("graph neural networks")
+    stored = web_client.classify_source("Graph Neural Networks")
+    cached = web_client.get_cached_classification("graph  neural networks")
+
+    # Assert
+    assert missing is None
+    assert cached is stored
+    web_client.chain.invoke.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_aclassify_source_awaits_chain(web_client):
+    """
+    Tests that async classification awaits the chain and shares the cache.
+    """
+    # Arrange
+    web_client.chain.ainvoke = AsyncMock(
+        return_value=json.dumps({"source": "reddit", "feed": "MachineLearning"})
+    )
+
+    # Act
+    first = await web_client.aclassify_source("ml career advice")
+    second = web_client.classify_source("ML career advice")
+
+    # Assert
+    assert first.source_type == "community"
+    assert second is first
+    web_client.chain.ainvoke.assert_awaited_once_with({"query": "ml career advice"})
+    web_client.chain.invoke.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_aclassify_source_batches_concurrent_queries(web_client):
+    """
+    Tests that concurrent async classifications are answered by one LLM call.
+    """
+    # Arrange
+    web_client.batch_chain = MagicMock()
+    web_client.batch_chain.ainvoke = AsyncMock(
+        return_value=json.dumps(
+            [
+                {"source": "arxiv", "feed": "cs.CV"},
+                {"source": "reddit", "feed": "MachineLearning"},
+            ]
+        )
+    )
+    web_client.chain.ainvoke = AsyncMock()
+
+    # Act
+    results = await asyncio.gather(
+        web_client.aclassify_source("vision transformers"),
+        web_client.aclassify_source("ml career advice"),
+    )
+
+    # Assert
+    assert [r.suggested_category for r in results] == ["cs.CV", "MachineLearning"]
+    web_client.batch_chain.ainvoke.assert_awaited_once_with(
+        {"queries": "0: vision transformers\n1: ml career advice"}
+    )
+    web_client.chain.ainvoke.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_aclassify_source_falls_back_to_single_calls(web_client):
+    """
+    Tests that a malformed batch answer is retried query by query, and that a
+    query which still fails gets the (uncached) fallback.
+    """
+    # Arrange
+    web_client.batch_chain = MagicMock()
+    web_client.batch_chain.ainvoke = AsyncMock(return_value="not json")
+    web_client.chain.ainvoke = AsyncMock(
+        side_effect=[json.dumps({"source": "arxiv", "feed": "cs.LG"}), "still not json"]
+    )
+
+    # Act
+    good, bad = await asyncio.gather(
+        web_client.aclassify_source("graph learning"),
+        web_client.aclassify_source("gibberish"),
+    )
+
+    # Assert
+    assert good.suggested_category == "cs.LG"
+    assert bad is FALLBACK_CLASSIFICATION
+    assert web_client.get_cached_classification("graph learning") is good
+    assert web_client.get_cached_classification("gibberish") is None
+
+
+def test_session_does_not_retry_read_timeouts():
+    """
+    Tests that a slow completion is not re-submitted after a read timeout,
+    while connect errors and retryable statuses still are.
+    """
+    # Act
+    retry = _session.get_adapter(API_URL).max_retries
+
+    # Assert
+    assert retry.read == 0
+    assert retry.total == 3
+    assert 503 in retry.status_forcelist
@@ -0,0 +1,64 @@
+from src.services.semantic_cache import SemanticCache
+
+
+def test_similar_vector_returns_cached_value():
+    """
+    Tests that a vector above the similarity threshold hits the cache.
+    """
+    # Arrange
+    cache = SemanticCache(threshold=0.93)
+    cache.put([1.0, 0.0, 0.0], "cs.CV")
+    cache.put([0.0, 1.0, 0.0], "MachineLearning")
+
+    # Act
+    result = cache.get([0.98, 0.05, 0.0])
+
+    # Assert
+    assert result == "cs.CV"
+
+
+def test_dissimilar_vector_misses():
+    """
+    Tests that a vector below the similarity threshold is a miss.
+    """
+    # Arrange
+    cache = SemanticCache(threshold=0.93)
+    cache.put([1.0, 0.0, 0.0], "cs.CV")
+
+    # Act
+    result = cache.get([0.7, 0.7, 0.0])
+
+    # Assert
+    assert result is None
+
+
+def test_empty_vectors_are_ignored():
+    """
+    Tests that empty embeddings (failed embedding calls) are neither stored nor matched.
+    """
+    # Arrange
+    cache = SemanticCache()
+
+    # Act
+    cache.put([], "cs.CV")
+
+    # Assert
+    assert len(cache) == 0
+    assert cache.get([]) is None
+
+
+def test_oldest_entries_are_evicted():
+    """
+    Tests that the cache is bounded by maxsize.
+    """
+    # Arrange
+    cache = SemanticCache(maxsize=2)
+
+    # Act
+    cache.put([1.0, 0.0], "a")
+    cache.put([0.0, 1.0], "b")
+    cache.put([-1.0, 0.0], "c")
+
+    # Assert
+    assert len(cache) == 2
+    assert cache.get([1.0, 0.0]) is None
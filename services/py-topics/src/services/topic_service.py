@@ -1,9 +1,11 @@
 import asyncio
+import hashlib
 import numpy as np
-from typing import List, Dict
+from collections import OrderedDict
+from typing import List, Dict, Sequence
 import uuid
 from bertopic import BERTopic
-import pandas as pd
+from umap import UMAP
 from sklearn.feature_extraction.text import CountVectorizer
 from niche_explorer_models.models.embedding_request import EmbeddingRequest
 from niche_explorer_models.models.generate_text_request import GenerateTextRequest
@@ -16,6 +18,14 @@ import re
 
 logger = logging.getLogger(__name__)
 
+# Maximum number of article embeddings kept in the in-process content-hash cache;
+# entries are float32 arrays (~3 KB each at 768 dimensions), not float lists
+EMBEDDING_CACHE_SIZE = 10_000
+
+# Title clean-up patterns, compiled once
+_TOPIC_ID_PREFIX_RE = re.compile(r"^\d+_")
+_LABEL_PREFIX_RE = re.compile(r"^(label|topic|name):?\s*\"?", re.IGNORECASE)
+
 # Prompts for the LLM
 LABEL_PROMPT = "Your task is to create a concise, 5-word topic label. The topic is defined by these keywords: [KEYWORDS] and these documents: [DOCUMENTS]. Return ONLY the label itself, with no additional text or explanations."
 DESCRIPTION_PROMPT = "Your task is to write a two-sentence summary for a topic. The topic is defined by these keywords: [KEYWORDS] and these documents: [DOCUMENTS]. Return ONLY the two-sentence summary, with no additional text or explanations."
@@ -32,12 +42,27 @@ class TopicDiscoveryService:
         self.genai_base_url = genai_base_url
         self.logger = logging.getLogger(__name__)
         self.http_client: httpx.AsyncClient | None = None
+        # LRU of content hash -> embedding, see `_get_embeddings`
+        self._embedding_cache: OrderedDict[str, np.ndarray] = OrderedDict()
 
     async def _get_async_client(self) -> httpx.AsyncClient:
         if self.http_client is None:
-            self.http_client = httpx.AsyncClient(timeout=60.0)
+            # One pooled keep-alive client for all calls to the GenAI service:
+            # the per-topic fan-out reuses warm connections, and connect
+            # errors are retried at the transport level.
+            transport = httpx.AsyncHTTPTransport(
+                retries=2,
+                limits=httpx.Limits(max_connections=32, max_keepalive_connections=32),
+            )
+            self.http_client = httpx.AsyncClient(transport=transport, timeout=60.0)
         return self.http_client
 
+    async def aclose(self) -> None:
+        """Close the pooled HTTP client (called on application shutdown)."""
+        if self.http_client is not None:
+            await self.http_client.aclose()
+            self.http_client = None
+
     async def discover_topic(
         self,
         query: str,
@@ -54,18 +79,26 @@ class TopicDiscoveryService:
             )
 
         try:
-            embeddings = await self._get_embeddings(article_keys, articles)
+            # Document text per article, built once and shared by the
+            # embedding lookup and the topic model
+            all_docs = [self._doc_text(art) for art in articles]
+            embeddings = await self._get_embeddings(article_keys, articles, all_docs)
             valid_indices = [i for i, emb in enumerate(embeddings) if emb is not None]
             if not valid_indices:
                 raise ValueError("Could not retrieve any embeddings.")
 
             final_articles = [articles[i] for i in valid_indices]
-            embeddings_array = np.array(
-                [embeddings[i] for i in valid_indices], dtype=float
+            # float32, C-contiguous: the dtype UMAP/HDBSCAN's numba kernels
+            # work in, so no converted copy is made and bandwidth is halved.
+            # Filled row by row into a preallocated matrix – no intermediate
+            # nested list and no float64 staging array.
+            embeddings_array = np.empty(
+                (len(valid_indices), len(embeddings[valid_indices[0]])),
+                dtype=np.float32,
             )
-            docs = [
-                f"{art.title} {art.summary or ''}".strip() for art in final_articles
-            ]
+            for row, i in enumerate(valid_indices):
+                embeddings_array[row] = embeddings[i]
+            docs = [all_docs[i] for i in valid_indices]
 
             vectorizer_model = CountVectorizer(stop_words="english")
             topic_model = BERTopic(
@@ -90,14 +123,16 @@ class TopicDiscoveryService:
             generated_reps = await asyncio.gather(*tasks)
             rep_map = {rep["id"]: rep for rep in generated_reps if rep}
 
-            documents_df = pd.DataFrame(
-                {"doc": docs, "article": final_articles, "topic": topic_model.topics_}
-            )
-            articles_by_topic = (
-                documents_df[documents_df.topic != -1]
-                .groupby("topic")["article"]
-                .apply(list)
-            )
+            # Group document positions by topic; docs, final_articles and
+            # embeddings_array are parallel columns indexed by that position
+            indices_by_topic: dict[int, list[int]] = {}
+            for idx, assigned_topic in enumerate(topic_model.topics_):
+                if assigned_topic != -1:
+                    indices_by_topic.setdefault(assigned_topic, []).append(idx)
+            articles_by_topic = {
+                topic_id: [final_articles[i] for i in indices]
+                for topic_id, indices in indices_by_topic.items()
+            }
             topic_id_to_uuid = {
                 topic_id: str(uuid.uuid4()) for topic_id in articles_by_topic.keys()
             }
@@ -126,18 +161,27 @@ class TopicDiscoveryService:
                 # ------------------------------------------------------------
                 child_topics: list[Topic] = []
                 if len(topic_articles) > 10:
-                    child_docs = [
-                        f"{art.title} {art.summary or ''}".strip()
-                        for art in topic_articles
-                    ]
+                    child_indices = indices_by_topic[topic_id]
+                    child_docs = [docs[i] for i in child_indices]
 
                     try:
-                        # Use the same embeddings for these docs (slice by index)
-                        child_indices = [docs.index(d) for d in child_docs]
+                        # Use the same embeddings for these docs (slice by position)
                         child_embs = embeddings_array[child_indices]
 
+                        # BERTopic's default UMAP, but with n_neighbors capped
+                        # below the sample count – a topic holds only tens of
+                        # documents and UMAP degenerates when n_neighbors >= n
                         child_model = BERTopic(
-                            min_topic_size=2, nr_topics=None, verbose=False
+                            umap_model=UMAP(
+                                n_neighbors=min(15, len(child_indices) - 1),
+                                n_components=5,
+                                min_dist=0.0,
+                                metric="cosine",
+                                low_memory=False,
+                            ),
+                            min_topic_size=2,
+                            nr_topics=None,
+                            verbose=False,
                         )
                         child_model.fit_transform(child_docs, child_embs)
 
@@ -311,43 +355,90 @@ class TopicDiscoveryService:
         return resp.json().get("text", "")
 
     async def _get_embeddings(
-        self, article_keys: list, articles: list
-    ) -> List[list[float] | None]:
+        self, article_keys: list, articles: list, texts: List[str] | None = None
+    ) -> List[Sequence[float] | None]:
+        """Embeddings in article order; None where none could be obtained.
+
+        Cached entries come back as float32 arrays, fresh ones as lists.
+        """
         client = await self._get_async_client()
-        embeddings: List[list[float] | None] = [None] * len(articles)
+        embeddings: List[Sequence[float] | None] = [None] * len(articles)
+        if texts is None:
+            texts = [self._doc_text(art) for art in articles]
+
+        # Content-hash cache first: feeds overlap heavily between polls, so
+        # most articles were already embedded in an earlier request.
+        content_keys = [self._content_key(text) for text in texts]
+        for idx, key in enumerate(content_keys):
+            cached = self._embedding_cache.get(key)
+            if cached is not None:
+                self._embedding_cache.move_to_end(key)
+                embeddings[idx] = cached
+
+        pending_indices = [i for i, emb in enumerate(embeddings) if emb is None]
+        if not pending_indices:
+            return embeddings
+
+        # Request each article id once, even if the same article appears at
+        # several positions, then fan the vector back out to every position
+        positions_by_key: Dict[str, List[int]] = {}
+        for i in pending_indices:
+            positions_by_key.setdefault(article_keys[i], []).append(i)
+        unique_keys = list(positions_by_key)
+
+        def _assign(key: str, emb: list[float] | None) -> None:
+            for pos in positions_by_key[key]:
+                embeddings[pos] = emb
+
         try:
             resp = await client.get(
                 f"{self.genai_base_url.rstrip('/')}/api/v1/embeddings",
-                params={"ids": article_keys},
+                params={"ids": unique_keys},
             )
             resp.raise_for_status()
-            for idx, emb in enumerate(resp.json().get("embeddings", [])):
+            for key, emb in zip(unique_keys, resp.json().get("embeddings", [])):
                 if emb:
-                    embeddings[idx] = emb
+                    _assign(key, emb)
         except Exception as e:
             self.logger.error("GET /embeddings failed: %s", e)
 
-        missing_indices = [i for i, emb in enumerate(embeddings) if emb is None]
-        if missing_indices:
-            texts_to_embed = [
-                f"{articles[i].title} {articles[i].summary or ''}".strip()
-                for i in missing_indices
-            ]
-            ids_to_embed = [article_keys[i] for i in missing_indices]
+        missing_keys = [
+            key for key in unique_keys if embeddings[positions_by_key[key][0]] is None
+        ]
+        if missing_keys:
+            texts_to_embed = [texts[positions_by_key[key][0]] for key in missing_keys]
             try:
-                req = EmbeddingRequest(texts=texts_to_embed, ids=ids_to_embed)
+                req = EmbeddingRequest(texts=texts_to_embed, ids=missing_keys)
                 resp = await client.post(
                     f"{self.genai_base_url.rstrip('/')}/api/v1/embeddings",
                     json=req.model_dump(by_alias=True),
                 )
                 resp.raise_for_status()
-                for idx, emb in zip(missing_indices, resp.json().get("embeddings", [])):
-                    embeddings[idx] = emb
+                for key, emb in zip(missing_keys, resp.json().get("embeddings", [])):
+                    _assign(key, emb)
             except Exception as e:
                 self.logger.error("POST /embeddings failed: %s", e)
 
+        for idx in pending_indices:
+            if embeddings[idx]:
+                self._cache_embedding(content_keys[idx], embeddings[idx])
+
         return embeddings
 
+    @staticmethod
+    def _doc_text(article) -> str:
+        return f"{article.title} {article.summary or ''}".strip()
+
+    @staticmethod
+    def _content_key(text: str) -> str:
+        return hashlib.blake2b(text.encode(), digest_size=16).hexdigest()
+
+    def _cache_embedding(self, key: str, embedding: Sequence[float]) -> None:
+        self._embedding_cache[key] = np.asarray(embedding, dtype=np.float32)
+        self._embedding_cache.move_to_end(key)
+        if len(self._embedding_cache) > EMBEDDING_CACHE_SIZE:
+            self._embedding_cache.popitem(last=False)
+
     def _fallback_response(self, query: str, articles: list) -> TopicDiscoveryResponse:
         return TopicDiscoveryResponse(
             query=query,
@@ -365,10 +456,8 @@ class TopicDiscoveryService:
         )
 
     def _clean_topic_title(self, title: str) -> str:
-        base_title = re.sub(r"^\d+_", "", title).replace("_", " ")
-        base_title = re.sub(
-            r"^(label|topic|name):?\s*\"?", "", base_title, flags=re.IGNORECASE
-        ).strip()
+        base_title = _TOPIC_ID_PREFIX_RE.sub("", title).replace("_", " ")
+        base_title = _LABEL_PREFIX_RE.sub("", base_title).strip()
         base_title = base_title.strip('"')
         return base_title.capitalize()
 
@@ -1,3 +1,4 @@
+import numpy as np
 import pytest
 import pandas as pd
 from unittest.mock import MagicMock, AsyncMock, patch
@@ -160,3 +161,132 @@ async def test_embedding_fetch_fallback(
     # Assert
     mock_http_client.get.assert_awaited_once()
     mock_http_client.post.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_aclose_releases_http_client(topic_service):
+    """
+    Tests that the pooled HTTP client is closed and recreated lazily afterwards.
+    """
+    # Arrange
+    client = await topic_service._get_async_client()
+
+    # Act
+    await topic_service.aclose()
+
+    # Assert
+    assert client.is_closed
+    assert topic_service.http_client is None
+    assert await topic_service._get_async_client() is not client
+
+
+@pytest.mark.asyncio
+async def test_embeddings_are_cached_by_content(topic_service, mock_articles, mocker):
+    """
+    Tests that articles embedded once are served from the content-hash cache
+    and only unseen articles are requested from the GenAI service.
+    """
+    # Arrange
+    mock_http_client = mocker.patch.object(
+        topic_service, "http_client", new_callable=AsyncMock
+    )
+    first_response = MagicMock()
+    first_response.json.return_value = {"embeddings": [[0.1, 0.2], [0.3, 0.4]]}
+    second_response = MagicMock()
+    second_response.json.return_value = {"embeddings": [[0.5, 0.6]]}
+    mock_http_client.get.side_effect = [first_response, second_response]
+
+    # Act
+    await topic_service._get_embeddings(["1", "2"], mock_articles[:2])
+    embeddings = await topic_service._get_embeddings(["1", "2", "3"], mock_articles)
+
+    # Assert
+    np.testing.assert_allclose(
+        np.asarray(embeddings, dtype=np.float32), [[0.1, 0.2], [0.3, 0.4], [0.5, 0.6]]
+    )
+    assert all(
+        isinstance(topic_service._embedding_cache[key], np.ndarray)
+        and topic_service._embedding_cache[key].dtype == np.float32
+        for key in topic_service._embedding_cache
+    )
+    second_call = mock_http_client.get.await_args_list[1]
+    assert second_call.kwargs["params"] == {"ids": ["3"]}
+    mock_http_client.post.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_duplicate_article_ids_are_requested_once(
+    topic_service, mock_articles, mocker
+):
+    """
+    Tests that an article appearing twice is fetched once and filled at both positions.
+    """
+    # Arrange
+    mock_http_client = mocker.patch.object(
+        topic_service, "http_client", new_callable=AsyncMock
+    )
+    response = MagicMock()
+    response.json.return_value = {"embeddings": [[0.1, 0.2], [0.3, 0.4]]}
+    mock_http_client.get.return_value = response
+    articles = [mock_articles[0], mock_articles[1], mock_articles[0]]
+
+    # Act
+    embeddings = await topic_service._get_embeddings(["1", "2", "1"], articles)
+
+    # Assert
+    assert embeddings == [[0.1, 0.2], [0.3, 0.4], [0.1, 0.2]]
+    assert mock_http_client.get.await_args.kwargs["params"] == {"ids": ["1", "2"]}
+
+
+@pytest.mark.asyncio
+@patch("src.services.topic_service.UMAP")
+@patch("src.services.topic_service.BERTopic")
+@patch("src.services.topic_service.CountVectorizer")
+async def test_sub_clustering_caps_umap_neighbors(
+    mock_vectorizer, mock_bertopic, mock_umap, topic_service, mocker
+):
+    """
+    Tests that a large topic is sub-clustered through UMAP with n_neighbors
+    kept below the number of documents in that topic.
+    """
+    # Arrange
+    articles = [
+        Article(
+            id=str(i),
+            title=f"Paper {i}",
+            summary=f"Summary {i}.",
+            source="arxiv",
+            link=f"http://example.com/{i}",
+        )
+        for i in range(12)
+    ]
+    mocker.patch.object(
+        topic_service,
+        "_get_embeddings",
+        new_callable=AsyncMock,
+        return_value=[[float(i), 1.0] for i in range(12)],
+    )
+    mock_topic_model = MagicMock()
+    mock_topic_model.get_topic_info.return_value = pd.DataFrame(
+        {"Topic": [0], "Name": ["0_mock_topic"], "Count": [12]}
+    )
+    mock_topic_model.topics_ = [0] * 12
+    mock_bertopic.return_value = mock_topic_model
+    mocker.patch(
+        "src.services.topic_service.TopicDiscoveryService._generate_representations_for_topic",
+        return_value={"id": 0, "label": "Mocked Topic", "description": "Mocked"},
+    )
+
+    # Act
+    await topic_service.discover_topic(
+        query="AI Research",
+        article_keys=[a.id for a in articles],
+        articles=articles,
+    )
+
+    # Assert
+    mock_umap.assert_called_once()
+    assert mock_umap.call_args.kwargs["n_neighbors"] == 11
+    assert mock_umap.call_args.kwargs["metric"] == "cosine"
+    child_kwargs = mock_bertopic.call_args_list[1].kwargs
+    assert child_kwargs["umap_model"] is mock_umap.return_value
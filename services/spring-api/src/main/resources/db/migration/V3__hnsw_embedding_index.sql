@@ -0,0 +1,15 @@
+-- Replace the IVFFlat embedding index with HNSW
+-- HNSW needs no training data (IVFFlat lists are fixed at build time) and gives
+-- higher QPS at >= 0.99 recall. Query-time breadth is set per session via
+-- hnsw.ef_search (see HNSW_EF_SEARCH in py-genai).
+
+-- Build memory/parallelism for this session only; the build spills to disk
+-- beyond maintenance_work_mem, so keep it modest for small DB containers
+SET maintenance_work_mem = '512MB';
+SET max_parallel_maintenance_workers = 2;
+
+DROP INDEX IF EXISTS article_embedding_idx;
+
+CREATE INDEX IF NOT EXISTS idx_article_embedding_hnsw
+    ON article USING hnsw (embedding halfvec_cosine_ops)
+    WITH (m = 24, ef_construction = 128);
@@ -0,0 +1,19 @@
+-- Covering index for the embedding cache lookup in py-genai:
+--   SELECT external_id, embedding FROM article
+--   WHERE external_id = ANY(...) AND embedding_model = ... AND embedding IS NOT NULL
+-- Lets Postgres answer it with an index-only scan instead of visiting the heap.
+-- halfvec(768) entries (~1.5 KB) fit within the B-tree tuple size limit.
+
+-- Which embedding backend/model produced article.embedding. Vectors from
+-- different models live in different spaces, so py-genai only reuses cached
+-- rows whose tag matches its configured model (EMBEDDING_MODEL_TAG).
+ALTER TABLE article ADD COLUMN IF NOT EXISTS embedding_model TEXT;
+
+-- Everything cached so far came from the default Google backend
+UPDATE article
+    SET embedding_model = 'google:models/embedding-001'
+    WHERE embedding IS NOT NULL AND embedding_model IS NULL;
+
+CREATE INDEX IF NOT EXISTS idx_article_external_id_emb
+    ON article (external_id, embedding_model) INCLUDE (embedding)
+    WHERE embedding IS NOT NULL;